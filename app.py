@@ -2,12 +2,20 @@
 Main Streamlit application for video transcription.
 """
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import os
-import torch
 import requests
 import json
+import re
 import time
-from typing import Optional, Dict, Any, List, Tuple
+import concurrent.futures
+import functools
+import threading
+from heapq import merge
+from itertools import chain
+from operator import itemgetter
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, Callable
 
 # Import our modules
 from config_manager import ConfigManager
@@ -17,29 +25,149 @@ from utils import (
     validate_time_range, 
     generate_filename, 
     ensure_directory, 
-    safe_file_removal
+    safe_file_removal,
+    TokenBucket
 )
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson parses chat pages several times faster; stdlib json accepts the same bytes input
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+# 프로필 JSON 전체(배지, 색상, 권한 등)를 파싱하지 않고 닉네임 필드만 찾기 위한 패턴
+_NICKNAME_RE = re.compile(r'"nickname"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# HH:MM:SS, MM:SS 또는 SS (시·분 그룹은 선택)
+_TIME_STR_RE = re.compile(r'^(?:(?:(\d+):)?(\d+):)?(\d+)$')
+
+# 쿠키 정리 및 자막/채팅 동기화에 쓰는 패턴
+_WS_RE = re.compile(r'\s+')
+# 트랜스크립트에서 첫 HH:MM:SS가 있는 줄 전체를 한 번의 스캔으로 찾는 패턴
+_TRANSCRIPT_TS_RE = re.compile(r'^[^\n]*?(\d{2}):(\d{2}):(\d{2})[^\n]*', re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_nickname(profile_json: str) -> str:
+    """프로필 JSON에서 닉네임만 추출 (같은 시청자의 반복 채팅은 캐시에서 반환)"""
+    match = _NICKNAME_RE.search(profile_json)
+    if match:
+        nickname = match.group(1)
+        if '\\' not in nickname:
+            return nickname
+        # 이스케이프가 있으면 닉네임 문자열만 JSON 규칙으로 복원
+        return json.loads(f'"{nickname}"')
+    return _json_loads(profile_json).get("nickname", "Unknown")
+
+
+@functools.lru_cache(maxsize=8192)
+def _seconds_to_chat_timestamp(seconds: int) -> str:
+    """초를 [HH:MM:SS] 형식으로 변환 (같은 초에 몰린 채팅은 캐시에서 반환)"""
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"[{hours:02d}:{minutes:02d}:{secs:02d}]"
+
+
+@st.cache_resource(show_spinner=False)
+def get_config_manager() -> ConfigManager:
+    """Return the process-wide ConfigManager so config.json is read once, not on every rerun.
+
+    save_config() updates the in-memory config of this same instance, so saved
+    settings are visible on the next rerun without reloading the file.
+    """
+    return ConfigManager()
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_audio_processor(whisper_model: str, hf_token: Optional[str],
+                        diarization_backend: str, use_gpu: bool) -> AudioProcessor:
+    """
+    Get an AudioProcessor shared across reruns for the given settings.
+    
+    Models are loaded lazily by AudioProcessor.load_models(), so only the first
+    transcription with a given combination pays the model loading cost.
+    """
+    return AudioProcessor(
+        whisper_model=whisper_model,
+        hf_token=hf_token,
+        diarization_backend=diarization_backend,
+        use_gpu=use_gpu
+    )
+
+
+class _StreamLookupError(Exception):
+    """Raised inside the cached stream lookup so failures are not cached."""
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_video_streams(video_no: str, cookies: Optional[str]) -> Dict[str, Any]:
+    """Fetch stream metadata once per (video_no, cookies) for the cache TTL."""
+    stream_data, error = ChzzkDownloader.get_video_streams(video_no, cookies)
+    if error:
+        raise _StreamLookupError(error)
+    return stream_data
+
+
+def get_video_streams_cached(video_no: str, cookies: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Cached variant of ChzzkDownloader.get_video_streams with the same return shape."""
+    try:
+        return _cached_video_streams(video_no, cookies), None
+    except _StreamLookupError as e:
+        return None, str(e)
+
+
+@dataclass
+class SessionInputs:
+    """Main-panel inputs that the video info panel stores in st.session_state."""
+    video_url: str = ''
+    start_time: str = '00:00:00'
+    end_time: str = '00:01:00'
+    enable_diarization: bool = False
+    enable_chat_collection: bool = False
+
+    @classmethod
+    def from_session(cls) -> "SessionInputs":
+        """Read all inputs from session state in one pass."""
+        ss = st.session_state
+        return cls(
+            video_url=ss.get('video_url', cls.video_url),
+            start_time=ss.get('start_time', cls.start_time),
+            end_time=ss.get('end_time', cls.end_time),
+            enable_diarization=ss.get('enable_diarization', cls.enable_diarization),
+            enable_chat_collection=ss.get('enable_chat_collection', cls.enable_chat_collection)
+        )
+
 
 class TranscriptionApp:
     """Main application class for video transcription."""
+
+    # 채팅 병렬 수집 설정
+    CHAT_MAX_WORKERS = 4
+    CHAT_MIN_WINDOW_MS = 5 * 60 * 1000
+    # 전체 창이 공유하는 요청 속도 제한 (429/503은 세션의 Retry가 Retry-After를 따라 재시도)
+    CHAT_REQUESTS_PER_SECOND = 8
+    CHAT_REQUEST_BURST = 4
+
+    # Cached (kind, device_name) from _probe_gpu
+    _gpu_probe_result: Optional[Tuple[Optional[str], Optional[str]]] = None
     
     def __init__(self):
         """Initialize the application."""
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config_manager()
         self.setup_page_config()
     
     # ==========================
     # 채팅 크롤링 관련 메서드들
     # ==========================
     
-    def milliseconds_to_timestamp(self, ms: int) -> str:
+    @staticmethod
+    def milliseconds_to_timestamp(ms: int) -> str:
         """밀리초를 [HH:MM:SS] 형식으로 변환"""
-        seconds = ms // 1000
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        return f"[{hours:02d}:{minutes:02d}:{secs:02d}]"
+        return _seconds_to_chat_timestamp(ms // 1000)
     
     def timestamp_to_milliseconds(self, time_str: str) -> int:
         """시간 문자열을 밀리초로 변환"""
@@ -48,17 +176,12 @@ class TranscriptionApp:
         if time_str.isdigit():
             return int(time_str) * 1000
         
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            total_seconds = hours * 3600 + minutes * 60 + seconds
-        elif len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            total_seconds = minutes * 60 + seconds
-        else:
+        match = _TIME_STR_RE.match(time_str)
+        if not match:
             raise ValueError("잘못된 시간 형식입니다. HH:MM:SS, MM:SS, 또는 초 단위로 입력하세요.")
         
-        return total_seconds * 1000
+        hours, minutes, seconds = match.groups()
+        return (int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds)) * 1000
     
     def clean_cookies(self, cookies_input: str) -> Optional[str]:
         """쿠키 문자열을 정리하여 HTTP 헤더에 사용 가능한 형태로 변환"""
@@ -69,8 +192,7 @@ class TranscriptionApp:
         cleaned = cookies_input.replace('\n', ' ').replace('\r', ' ')
         
         # 여러 공백을 하나로 통합
-        import re
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WS_RE.sub(' ', cleaned).strip()
         
         # 세미콜론으로 끝나지 않으면 추가
         if not cleaned.endswith(';'):
@@ -78,13 +200,17 @@ class TranscriptionApp:
         
         return cleaned
 
-    def extract_chat_message(self, chat: Dict, start_time_ms: int = 0) -> str:
-        """채팅 메시지를 포맷된 문자열로 추출 (상대적 타임스탬프 적용)"""
+    def extract_chat_message(self, chat: Dict, start_time_ms: int = 0,
+                             player_time: Optional[int] = None) -> str:
+        """채팅 메시지를 포맷된 문자열로 추출 (상대적 타임스탬프 적용)
+
+        player_time을 이미 읽었다면 넘겨서 같은 필드를 다시 조회하지 않게 한다.
+        """
         try:
-            profile_data = json.loads(chat.get("profile", "{}"))
-            nickname = profile_data.get("nickname", "Unknown")
+            nickname = _parse_nickname(chat.get("profile") or "{}")
             content = chat.get("content", "")
-            player_time = chat.get("playerMessageTime", 0)
+            if player_time is None:
+                player_time = chat.get("playerMessageTime", 0)
             
             # 상대적 타임스탬프 계산 (구간 시작 시간 기준)
             relative_time = player_time - start_time_ms
@@ -102,8 +228,14 @@ class TranscriptionApp:
     
     def collect_chzzk_video_chats(self, video_no: str, auth_cookies: Optional[str] = None,
                                  start_time_ms: Optional[int] = None,
-                                 end_time_ms: Optional[int] = None) -> List[str]:
-        """지정된 시간 구간의 채팅 수집 (chat.py 방식)"""
+                                 end_time_ms: Optional[int] = None,
+                                 log: Callable[[str], None] = print) -> List[Tuple[int, str]]:
+        """지정된 시간 구간의 채팅 수집 (구간을 나눠 병렬 수집)
+
+        auth_cookies는 clean_cookies()로 이미 정리된 문자열이어야 한다.
+        진행 로그는 log 콜백으로 전달한다 (기본값은 print).
+        반환값은 (구간 시작 기준 초, 포맷된 메시지) 목록이며 시간순이다.
+        """
         # Try v1 first, fall back to v2 if needed
         api_versions = ["v1", "v2"]
         headers = {
@@ -115,33 +247,87 @@ class TranscriptionApp:
             "Referer": f"https://chzzk.naver.com/video/{video_no}",
         }
         if auth_cookies:
-            cleaned_cookies = self.clean_cookies(auth_cookies)
-            if cleaned_cookies:
-                headers["Cookie"] = cleaned_cookies
+            headers["Cookie"] = auth_cookies
 
+        session = ChzzkDownloader.get_session()
         base_url = None
         for version in api_versions:
             test_url = f"https://api.chzzk.naver.com/service/{version}/videos/{video_no}/chats"
             try:
-                test_resp = requests.get(test_url, headers=headers,
-                                        params={"playerMessageTime": start_time_ms or 0,
-                                                "previousVideoChatSize": 1},
-                                        timeout=10)
+                test_resp = session.get(test_url, headers=headers,
+                                       params={"playerMessageTime": start_time_ms or 0,
+                                               "previousVideoChatSize": 1},
+                                       timeout=(3, 10))
                 if test_resp.status_code == 200:
-                    test_data = test_resp.json()
+                    test_data = _json_loads(test_resp.content)
                     if test_data.get("code") == 200:
                         base_url = test_url
-                        print(f"채팅 API {version} 사용")
+                        log(f"채팅 API {version} 사용")
                         break
             except Exception:
                 continue
 
         if not base_url:
-            print("채팅 API를 사용할 수 없습니다.")
+            log("채팅 API를 사용할 수 없습니다.")
             return []
 
-        all_chats = []
-        current_time = start_time_ms if start_time_ms is not None else 0
+        # nextPlayerMessageTime 커서 때문에 한 구간 안에서는 순차 요청만 가능하므로,
+        # 전체 구간을 여러 창으로 나눠 창마다 독립적으로 페이지를 따라간다.
+        # 각 창은 자기 구간 [시작, 끝)의 채팅만 소유하므로 창끼리 겹치지 않는다.
+        windows = self._split_chat_windows(start_time_ms, end_time_ms)
+        offset_ms = start_time_ms or 0
+        rate_limiter = TokenBucket(self.CHAT_REQUESTS_PER_SECOND, self.CHAT_REQUEST_BURST)
+        jobs = [
+            (base_url, headers, window_start, window_end, i == len(windows) - 1, offset_ms, rate_limiter, log)
+            for i, (window_start, window_end) in enumerate(windows)
+        ]
+        if len(jobs) == 1:
+            window_results = [self._collect_chat_window(*jobs[0])]
+        else:
+            log(f"채팅 구간을 {len(jobs)}개로 나눠 병렬 수집")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                window_results = list(executor.map(lambda job: self._collect_chat_window(*job), jobs))
+
+        # 창별 결과는 이미 중복 제거·정렬되어 있고 창 순서대로 이어지므로 그대로 연결.
+        # 초 단위 시각을 함께 넘겨 동기화 단계에서 타임스탬프를 다시 파싱하지 않게 한다.
+        return [
+            (max(player_time - offset_ms, 0) // 1000, msg)
+            for chats in window_results for player_time, msg in chats
+        ]
+
+    def _split_chat_windows(self, start_time_ms: Optional[int],
+                            end_time_ms: Optional[int]) -> List[Tuple[int, Optional[int]]]:
+        """채팅 수집 구간을 병렬 수집용 창 목록으로 분할"""
+        start = start_time_ms or 0
+        if end_time_ms is None or end_time_ms <= start:
+            return [(start, end_time_ms)]
+
+        span = end_time_ms - start
+        count = max(1, min(self.CHAT_MAX_WORKERS, span // self.CHAT_MIN_WINDOW_MS))
+        step = -(-span // count)  # ceil division
+
+        windows = []
+        window_start = start
+        while window_start < end_time_ms:
+            window_end = min(window_start + step, end_time_ms)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        return windows
+
+    def _collect_chat_window(self, base_url: str, headers: Dict[str, str],
+                             window_start: int, window_end: Optional[int],
+                             include_end: bool, offset_ms: int,
+                             rate_limiter: TokenBucket,
+                             log: Callable[[str], None] = print) -> List[Tuple[int, str]]:
+        """한 창(window) 안의 채팅을 nextPlayerMessageTime 커서를 따라 순차 수집
+
+        페이지마다 겹쳐 오는 previousVideoChats는 수집 중에 바로 걸러내고,
+        결과는 playerMessageTime 순으로 정렬해 반환한다.
+        """
+        # playerMessageTime별 메시지 목록 (같은 밀리초 안에서는 도착 순서 유지)
+        by_time: Dict[int, List[str]] = {}
+        seen_ids = set()
+        current_time = window_start
         previous_size = 50
         max_requests = 1000
         request_count = 0
@@ -152,66 +338,70 @@ class TranscriptionApp:
                 "previousVideoChatSize": previous_size,
             }
 
+            rate_limiter.acquire()
             try:
-                response = requests.get(base_url, headers=headers, params=params, timeout=15)
+                response = ChzzkDownloader.get_session().get(
+                    base_url, headers=headers, params=params, timeout=(3, 10)
+                )
             except requests.exceptions.RequestException as e:
-                print(f"네트워크 오류: {e}")
+                log(f"네트워크 오류: {e}")
                 break
 
             if response.status_code != 200:
-                print(f"API 요청 실패: HTTP {response.status_code}")
+                log(f"API 요청 실패: HTTP {response.status_code}")
                 if response.status_code == 403:
-                    print("403 오류: 성인인증이 필요할 수 있습니다.")
+                    log("403 오류: 성인인증이 필요할 수 있습니다.")
                 break
 
             try:
-                data = response.json()
+                data = _json_loads(response.content)
             except (ValueError, KeyError):
-                print("JSON 파싱 실패")
+                log("JSON 파싱 실패")
                 break
 
             if data.get("code") != 200:
-                print(f"API 응답 에러: {data.get('message', 'Unknown error')}")
+                log(f"API 응답 에러: {data.get('message', 'Unknown error')}")
                 break
 
             content = data.get("content", {})
             prev_chats = content.get("previousVideoChats", [])
             video_chats = content.get("videoChats", [])
-            batch = prev_chats + video_chats
 
-            if not batch:
+            if not prev_chats and not video_chats:
                 break
 
-            # 시간 범위 필터링
-            for chat in batch:
+            # 시간 범위 필터링 (이 창이 소유한 구간 기준)
+            for chat in chain(prev_chats, video_chats):
                 player_time = chat.get("playerMessageTime", 0)
 
-                if start_time_ms is not None and player_time < start_time_ms:
+                if player_time < window_start:
                     continue
-                if end_time_ms is not None and player_time > end_time_ms:
+                if window_end is not None:
+                    if player_time > window_end or (player_time == window_end and not include_end):
+                        continue
+
+                chat_id = (player_time, chat.get("userIdHash"), chat.get("content"))
+                if chat_id in seen_ids:
                     continue
+                seen_ids.add(chat_id)
 
-                chat_message = self.extract_chat_message(chat, start_time_ms or 0)
-                all_chats.append((player_time, chat_message))
+                chat_message = self.extract_chat_message(chat, offset_ms, player_time)
+                by_time.setdefault(player_time, []).append(chat_message)
 
             next_time = content.get("nextPlayerMessageTime")
             if next_time is None or next_time <= current_time:
                 break
 
-            # 종료 시간을 넘어섰으면 중단
-            if end_time_ms is not None and next_time > end_time_ms:
+            # 창의 끝을 넘어섰으면 중단 (다음 창이 이어서 수집)
+            if window_end is not None and next_time > window_end:
                 break
 
             current_time = next_time
             request_count += 1
-            time.sleep(0.3)
 
-        # 중복 제거 및 시간순 정렬
-        unique_chats = list({(t, msg) for t, msg in all_chats})
-        unique_chats.sort(key=lambda x: x[0])
-        chat_messages = [msg for _, msg in unique_chats]
-        return chat_messages
-    
+        # 정수 키만 정렬하면 되므로 메시지 문자열은 비교·해시하지 않는다
+        return [(t, msg) for t in sorted(by_time) for msg in by_time[t]]
+
         
     def setup_page_config(self):
         """Configure Streamlit page settings."""
@@ -232,57 +422,66 @@ class TranscriptionApp:
             Dictionary of current configuration values
         """
         with st.sidebar:
-            st.header("⚙️ 설정")
-            
-            # Download path
-            download_path = st.text_input(
-                "다운로드 경로", 
-                value=self.config_manager.get("download_path")
-            )
-            
-            # Whisper model selection
-            whisper_model_keys = list(WHISPER_MODELS.keys())
-            whisper_model_labels = [f"{k} - {v}" for k, v in WHISPER_MODELS.items()]
-            current_model = self.config_manager.get("whisper_model")
-            default_idx = whisper_model_keys.index(current_model) if current_model in whisper_model_keys else 0
-            whisper_model_idx = st.selectbox(
-                "Whisper 모델",
-                range(len(whisper_model_keys)),
-                format_func=lambda x: whisper_model_labels[x],
-                index=default_idx
-            )
-            whisper_model = whisper_model_keys[whisper_model_idx]
-
-            # Diarization backend selection
-            diar_keys = list(DIARIZATION_BACKENDS.keys())
-            diar_labels = list(DIARIZATION_BACKENDS.values())
-            diarization_backend = st.selectbox(
-                "화자분리 엔진",
-                range(len(diar_keys)),
-                format_func=lambda x: diar_labels[x],
-                index=0,
-                help="WeSpeaker/Simple Diarizer는 토큰 없이 사용 가능합니다."
+            self._render_sidebar_fragment()
+        return st.session_state["config"]
+
+    @st.fragment
+    def _render_sidebar_fragment(self):
+        """Sidebar widgets; as a fragment they rerun on their own without re-rendering the main panel."""
+        # Read the configuration once per render instead of one lookup per widget
+        cfg = self.config_manager.snapshot()
+        
+        st.header("⚙️ 설정")
+        
+        # Download path
+        download_path = st.text_input(
+            "다운로드 경로", 
+            value=cfg.get("download_path")
+        )
+        
+        # Whisper model selection
+        whisper_model_keys = list(WHISPER_MODELS.keys())
+        whisper_model_labels = [f"{k} - {v}" for k, v in WHISPER_MODELS.items()]
+        current_model = cfg.get("whisper_model")
+        default_idx = whisper_model_keys.index(current_model) if current_model in whisper_model_keys else 0
+        whisper_model_idx = st.selectbox(
+            "Whisper 모델",
+            range(len(whisper_model_keys)),
+            format_func=lambda x: whisper_model_labels[x],
+            index=default_idx
+        )
+        whisper_model = whisper_model_keys[whisper_model_idx]
+
+        # Diarization backend selection
+        diar_keys = list(DIARIZATION_BACKENDS.keys())
+        diar_labels = list(DIARIZATION_BACKENDS.values())
+        diarization_backend = st.selectbox(
+            "화자분리 엔진",
+            range(len(diar_keys)),
+            format_func=lambda x: diar_labels[x],
+            index=0,
+            help="WeSpeaker/Simple Diarizer는 토큰 없이 사용 가능합니다."
+        )
+        diarization_backend = diar_keys[diarization_backend]
+
+        # HuggingFace token (only needed for pyannote)
+        hf_token = ""
+        if diarization_backend == "pyannote":
+            hf_token = st.text_input(
+                "HuggingFace 토큰 (Pyannote용)",
+                value=cfg.get("huggingface_token"),
+                type="password",
+                help="Pyannote 화자분리는 HuggingFace 토큰이 필요합니다."
             )
-            diarization_backend = diar_keys[diarization_backend]
-
-            # HuggingFace token (only needed for pyannote)
-            hf_token = ""
-            if diarization_backend == "pyannote":
-                hf_token = st.text_input(
-                    "HuggingFace 토큰 (Pyannote용)",
-                    value=self.config_manager.get("huggingface_token"),
-                    type="password",
-                    help="Pyannote 화자분리는 HuggingFace 토큰이 필요합니다."
-                )
-            else:
-                hf_token = self.config_manager.get("huggingface_token")
-            
-            # Naver cookies
-            cookies_input = st.text_area(
-                "네이버 쿠키 (성인 인증용)",
-                value=self.config_manager.get("naver_cookies"),
-                height=100,
-                help="""성인 인증이 필요한 영상 접근을 위해 네이버 로그인 쿠키를 입력하세요.
+        else:
+            hf_token = cfg.get("huggingface_token")
+        
+        # Naver cookies
+        cookies_input = st.text_area(
+            "네이버 쿠키 (성인 인증용)",
+            value=cfg.get("naver_cookies"),
+            height=100,
+            help="""성인 인증이 필요한 영상 접근을 위해 네이버 로그인 쿠키를 입력하세요.
 필요한 쿠키: NID_AUT, NID_SES (주로 필요)
 형식 예시:
 - NID_AUT=값; NID_SES=값;
@@ -292,77 +491,90 @@ class TranscriptionApp:
 
 브라우저 개발자 도구 → Application → Cookies → chzzk.naver.com에서 확인 가능
 ※ 개행문자와 여분의 공백은 자동으로 정리됩니다."""
-            )
-            
-            # Output format
-            output_formats = self.config_manager.get_output_formats()
-            current_format = self.config_manager.get("output_format")
-            output_format = st.selectbox(
-                "출력 형식",
-                output_formats,
-                index=output_formats.index(current_format) if current_format in output_formats else 0
-            )
-            
-            # Default quality
-            quality_options = self.config_manager.get_quality_options()
-            current_quality = self.config_manager.get("default_quality")
-            default_quality = st.selectbox(
-                "기본 화질",
-                quality_options,
-                index=quality_options.index(current_quality) if current_quality in quality_options else 0
-            )
-            
-            # GPU usage
-            use_gpu = st.checkbox(
-                "GPU 사용 (CUDA/MPS)",
-                value=self.config_manager.get("use_gpu"),
-                help="GPU가 사용 가능한 경우 음성인식 속도를 크게 향상시킵니다."
-            )
-            
-            # GPU status display
-            self._display_gpu_status(use_gpu)
-            
-            # Save configuration
-            if st.button("설정 저장"):
-                new_config = {
-                    "download_path": download_path,
-                    "whisper_model": whisper_model,
-                    "huggingface_token": hf_token,
-                    "naver_cookies": cookies_input,
-                    "output_format": output_format,
-                    "default_quality": default_quality,
-                    "use_gpu": use_gpu,
-                    "diarization_backend": diarization_backend
-                }
-                if self.config_manager.save_config(new_config):
-                    st.success("설정이 저장되었습니다!")
-                else:
-                    st.warning("설정 저장에 실패했지만 세션에서는 적용됩니다.")
-
-            return {
+        )
+        
+        # Output format
+        output_formats = self.config_manager.get_output_formats()
+        current_format = cfg.get("output_format")
+        output_format = st.selectbox(
+            "출력 형식",
+            output_formats,
+            index=output_formats.index(current_format) if current_format in output_formats else 0
+        )
+        
+        # Default quality
+        quality_options = self.config_manager.get_quality_options()
+        current_quality = cfg.get("default_quality")
+        default_quality = st.selectbox(
+            "기본 화질",
+            quality_options,
+            index=quality_options.index(current_quality) if current_quality in quality_options else 0
+        )
+        
+        # GPU usage
+        use_gpu = st.checkbox(
+            "GPU 사용 (CUDA/MPS)",
+            value=cfg.get("use_gpu"),
+            help="GPU가 사용 가능한 경우 음성인식 속도를 크게 향상시킵니다."
+        )
+        
+        # GPU status display
+        self._display_gpu_status(use_gpu)
+        
+        # Save configuration
+        if st.button("설정 저장"):
+            new_config = {
                 "download_path": download_path,
                 "whisper_model": whisper_model,
-                "hf_token": hf_token,
-                "cookies_input": cookies_input,
+                "huggingface_token": hf_token,
+                "naver_cookies": cookies_input,
                 "output_format": output_format,
                 "default_quality": default_quality,
                 "use_gpu": use_gpu,
                 "diarization_backend": diarization_backend
             }
+            if self.config_manager.save_config(new_config):
+                st.success("설정이 저장되었습니다!")
+            else:
+                st.warning("설정 저장에 실패했지만 세션에서는 적용됩니다.")
+
+        st.session_state["config"] = {
+            "download_path": download_path,
+            "whisper_model": whisper_model,
+            "hf_token": hf_token,
+            "cookies_input": cookies_input,
+            "output_format": output_format,
+            "default_quality": default_quality,
+            "use_gpu": use_gpu,
+            "diarization_backend": diarization_backend
+        }
 
     def _display_gpu_status(self, use_gpu: bool):
         """Display GPU availability status."""
         if use_gpu:
-            if torch.cuda.is_available():
-                gpu_info = f"CUDA 사용 가능 ({torch.cuda.get_device_name(0)})"
-                st.success(gpu_info)
-            elif torch.backends.mps.is_available():
+            kind, name = self._probe_gpu()
+            if kind == "cuda":
+                st.success(f"CUDA 사용 가능 ({name})")
+            elif kind == "mps":
                 st.success("MPS (Apple Silicon) 사용 가능")
             else:
                 st.warning("GPU를 찾을 수 없습니다. CPU를 사용합니다.")
         else:
             st.info("CPU 모드로 설정됨")
 
+    @classmethod
+    def _probe_gpu(cls) -> Tuple[Optional[str], Optional[str]]:
+        """Probe GPU availability once; hardware does not change during a session."""
+        if cls._gpu_probe_result is None:
+            import torch
+            if torch.cuda.is_available():
+                cls._gpu_probe_result = ("cuda", torch.cuda.get_device_name(0))
+            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+                cls._gpu_probe_result = ("mps", None)
+            else:
+                cls._gpu_probe_result = (None, None)
+        return cls._gpu_probe_result
+
     def render_main_interface(self, config: Dict[str, Any]):
         """
         Render main video processing interface.
@@ -373,13 +585,17 @@ class TranscriptionApp:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            self._render_video_info_panel(config)
+            self._render_video_info_panel()
         
         with col2:
             self._render_execution_panel(config)
 
-    def _render_video_info_panel(self, config: Dict[str, Any]):
+    @st.fragment
+    def _render_video_info_panel(self):
         """Render video information and quality selection panel."""
+        # A fragment rerun replays the arguments of the last full run, so read the
+        # config the sidebar fragment stored most recently instead of taking it as one
+        config = st.session_state["config"]
         st.header("📹 영상 정보")
         
         # Video URL input
@@ -453,7 +669,7 @@ class TranscriptionApp:
             return
         
         cookies = self.clean_cookies(config["cookies_input"]) if config["cookies_input"].strip() else None
-        stream_data, error = ChzzkDownloader.get_video_streams(video_no, cookies)
+        stream_data, error = get_video_streams_cached(video_no, cookies)
         if error:
             st.error(error)
             return
@@ -499,22 +715,24 @@ class TranscriptionApp:
         
         if st.button("트랜스크립트 생성", type="primary", use_container_width=True):
             self._process_video_transcription(config)
+        
+        if st.button("🔄 모델 다시 로드", use_container_width=True,
+                     help="캐시된 Whisper/화자분리 모델을 비우고 다음 실행 때 새로 로드합니다."):
+            get_audio_processor.clear()
+            st.info("모델 캐시를 비웠습니다. 다음 실행 때 모델을 다시 로드합니다.")
 
     def _process_video_transcription(self, config: Dict[str, Any]):
         """Process video transcription with full pipeline."""
         # Validate inputs
-        video_url = st.session_state.get('video_url', '')
-        start_time = st.session_state.get('start_time', '00:00:00')
-        end_time = st.session_state.get('end_time', '00:01:00')
-        enable_diarization = st.session_state.get('enable_diarization', False)
-        enable_chat_collection = st.session_state.get('enable_chat_collection', False)
+        inputs = SessionInputs.from_session()
+        video_url = inputs.video_url
         
         if not video_url:
             st.error("영상 URL을 입력해주세요.")
             return
         
         # Validate time range
-        start_seconds, end_seconds, error = validate_time_range(start_time, end_time)
+        start_seconds, end_seconds, error = validate_time_range(inputs.start_time, inputs.end_time)
         if error:
             st.error(error)
             return
@@ -526,7 +744,7 @@ class TranscriptionApp:
         try:
             self._run_transcription_pipeline(
                 config, video_url, start_seconds, end_seconds, 
-                enable_diarization, enable_chat_collection, progress_bar, status_text
+                inputs.enable_diarization, inputs.enable_chat_collection, progress_bar, status_text
             )
         except Exception as e:
             st.error(f"처리 중 오류가 발생했습니다: {str(e)}")
@@ -536,6 +754,22 @@ class TranscriptionApp:
                                   enable_diarization: bool, enable_chat_collection: bool,
                                   progress_bar, status_text):
         """Run the complete transcription pipeline."""
+        # Step 0: Start loading models in the background.
+        # Model loading does not depend on the downloaded video, so it overlaps with
+        # the info lookup and download; _process_audio_transcription joins it.
+        # Reuse the processor (and its loaded models) from earlier runs with the same settings
+        audio_processor = get_audio_processor(
+            config["whisper_model"],
+            config["hf_token"] if enable_diarization else None,
+            config.get("diarization_backend", "auto") if enable_diarization else "none",
+            config["use_gpu"]
+        )
+        model_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        model_future = model_executor.submit(
+            self._load_models_with_context, audio_processor, get_script_run_ctx()
+        )
+        model_executor.shutdown(wait=False)
+        
         download_path = config["download_path"]
         ensure_directory(download_path)
         
@@ -549,7 +783,7 @@ class TranscriptionApp:
             return
         
         cookies = self.clean_cookies(config["cookies_input"]) if config["cookies_input"].strip() else None
-        stream_data, error = ChzzkDownloader.get_video_streams(video_no, cookies)
+        stream_data, error = get_video_streams_cached(video_no, cookies)
         if error:
             st.error(error)
             return
@@ -565,69 +799,127 @@ class TranscriptionApp:
             stream_data, selected_stream, download_path, config["output_format"], enable_chat_collection
         )
         
-        # Step 4: Collect chat first (if enabled)
-        chat_messages = []
+        # Step 4: Start chat collection in the background (if enabled)
+        # 채팅 수집은 네트워크 I/O뿐이고 다운로드·음성인식과 공유하는 데이터가 없으므로
+        # 백그라운드 스레드에서 돌리고 결과는 트랜스크립트가 끝난 뒤에 받는다.
+        chat_future = None
         if enable_chat_collection and chat_path:
-            status_text.text("💬 채팅을 수집하는 중...")
+            status_text.text("💬 채팅 수집을 시작하는 중...")
             progress_bar.progress(10)
             
             start_time_ms = start_seconds * 1000
             end_time_ms = end_seconds * 1000
             
-            # 쿠키 정리
-            cleaned_cookies = self.clean_cookies(cookies) if cookies else None
-            
-            # Create expander for debug logs
-            with st.expander("🔍 채팅 수집 디버그 로그", expanded=False):
-                debug_container = st.empty()
-                
-            # Capture debug output
-            import io
-            import sys
-            from contextlib import redirect_stdout
-            
-            debug_output = io.StringIO()
-            with redirect_stdout(debug_output):
-                chat_messages = self.collect_chzzk_video_chats(
-                    video_no, cleaned_cookies, start_time_ms, end_time_ms
-                )
-            
-            # Display debug output
-            debug_text = debug_output.getvalue()
-            with st.expander("🔍 채팅 수집 디버그 로그", expanded=True):
-                st.text_area("Debug Output", debug_text, height=300)
-            
-            if chat_messages:
-                with open(chat_path, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(chat_messages))
-                st.success(f"채팅 수집 완료: {len(chat_messages)}개 메시지")
-            else:
-                st.warning("채팅이 수집되지 않았습니다. 영상 처리를 계속합니다.")
+            chat_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            chat_future = chat_executor.submit(
+                self._collect_chats_with_log, video_no, cookies, start_time_ms, end_time_ms
+            )
+            chat_executor.shutdown(wait=False)
         
-        # Step 5: Download video
+        # Step 5: Download audio (falls back to full video download + extraction)
         status_text.text("📥 비디오를 다운로드하는 중...")
         
-        def update_download_progress(progress):
-            progress_bar.progress(20 + int(progress * 0.3))
+        # Throttle to ~10 updates/s; every call is a websocket message to the browser
+        last_update = {"time": 0.0, "value": -1}
         
-        success, message = ChzzkDownloader.download_video_segment(
-            selected_stream['base_url'], video_path, 
+        def update_download_progress(progress):
+            value = 20 + int(progress * 0.3)
+            now = time.monotonic()
+            if value == last_update["value"]:
+                return
+            if now - last_update["time"] < 0.1 and progress < 100:
+                return
+            progress_bar.progress(value)
+            last_update["time"] = now
+            last_update["value"] = value
+        
+        # 음성만 필요하므로 먼저 스트림에서 바로 WAV로 받아 영상 파일 쓰기/다시 읽기를 건너뛴다
+        audio_ready, _ = ChzzkDownloader.download_audio_segment(
+            selected_stream['base_url'], audio_path,
             start_seconds, end_seconds, update_download_progress
         )
+        if audio_ready:
+            success, message = True, "오디오 다운로드 완료"
+        else:
+            success, message = ChzzkDownloader.download_video_segment(
+                selected_stream['base_url'], video_path, 
+                start_seconds, end_seconds, update_download_progress
+            )
         
         if not success:
             st.error(message)
+            self._finish_chat_collection(chat_future, chat_path)
             return
         
         # Step 6: Process audio and transcription
-        self._process_audio_transcription(
-            video_path, audio_path, transcript_path, chat_path, config, 
-            enable_diarization, chat_messages, progress_bar, status_text
+        transcript = self._process_audio_transcription(
+            audio_processor, model_future, video_path, audio_path, transcript_path, config, 
+            enable_diarization, progress_bar, status_text, audio_ready
         )
         
+        # Step 7: Wait for the background chat collection
+        chat_messages = self._finish_chat_collection(chat_future, chat_path)
+        
+        if transcript is not None:
+            self._display_results(transcript, transcript_path, chat_path, chat_messages)
+        
         # Cleanup temporary files
         safe_file_removal(video_path, audio_path)
 
+    @staticmethod
+    def _load_models_with_context(audio_processor: AudioProcessor, ctx) -> None:
+        """Load models on a worker thread, attached to the script run so st.info messages still render."""
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        audio_processor.load_models()
+
+    @staticmethod
+    def _diarize_with_context(audio_processor: AudioProcessor, audio_path: str, audio, ctx):
+        """Run diarization on a worker thread, attached to the script run so st.info messages still render."""
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return audio_processor.perform_diarization(audio_path, audio=audio)
+
+    def _collect_chats_with_log(self, video_no: str, auth_cookies: Optional[str],
+                                start_time_ms: int, end_time_ms: int) -> Tuple[List[Tuple[int, str]], str]:
+        """채팅을 수집하고 수집 중 남긴 디버그 로그를 함께 반환 (백그라운드 스레드용)"""
+        # stdout을 가로채면 같은 시간에 도는 다른 스레드의 출력까지 섞이므로 콜백으로 모은다
+        # (list.append는 여러 수집 스레드에서 호출해도 안전)
+        logs: List[str] = []
+        chat_messages = self.collect_chzzk_video_chats(
+            video_no, auth_cookies, start_time_ms, end_time_ms, log=logs.append
+        )
+        return chat_messages, '\n'.join(logs)
+
+    def _finish_chat_collection(self, chat_future: Optional[concurrent.futures.Future],
+                                chat_path: Optional[str]) -> List[Tuple[int, str]]:
+        """백그라운드 채팅 수집 결과를 기다려 저장하고 디버그 로그를 표시"""
+        if chat_future is None:
+            return []
+        
+        try:
+            chat_messages, debug_text = chat_future.result()
+        except Exception as e:
+            # 채팅 수집 실패가 이미 끝난 트랜스크립트 표시를 막지 않도록 여기서 처리
+            chat_messages, debug_text = [], f"채팅 수집 중 오류 발생: {e}"
+        
+        # Display debug output
+        with st.expander("🔍 채팅 수집 디버그 로그", expanded=True):
+            st.text_area("Debug Output", debug_text, height=300)
+        
+        st.session_state['chat_bytes'] = None
+        if chat_messages:
+            # 메시지별로 인코딩해 바로 bytes로 합친다 (전체 str 사본을 거치지 않음)
+            chat_bytes = b'\n'.join(msg.encode('utf-8') for _, msg in chat_messages)
+            with open(chat_path, 'wb') as f:
+                f.write(chat_bytes)
+            st.session_state['chat_bytes'] = chat_bytes
+            st.success(f"채팅 수집 완료: {len(chat_messages)}개 메시지")
+        else:
+            st.warning("채팅이 수집되지 않았습니다.")
+        
+        return chat_messages
+
     def _get_selected_stream(self, stream_data: Dict[str, Any], config: Dict[str, Any]):
         """Get the selected stream quality."""
         if isinstance(st.session_state.get('selected_quality'), dict):
@@ -662,47 +954,62 @@ class TranscriptionApp:
         
         return tuple(paths)
 
-    def _process_audio_transcription(self, video_path: str, audio_path: str, 
-                                   transcript_path: str, chat_path: Optional[str], config: Dict[str, Any], 
-                                   enable_diarization: bool, chat_messages: List[str],
-                                   progress_bar, status_text):
-        """Process audio extraction and transcription."""
-        # Step 5: Extract audio
-        status_text.text("🎵 오디오를 추출하는 중...")
-        progress_bar.progress(55)
-        
-        audio_processor = AudioProcessor(
-            whisper_model=config["whisper_model"],
-            hf_token=config["hf_token"] if enable_diarization else None,
-            diarization_backend=config.get("diarization_backend", "auto") if enable_diarization else "none",
-            use_gpu=config["use_gpu"]
-        )
+    def _process_audio_transcription(self, audio_processor: AudioProcessor,
+                                   model_future: concurrent.futures.Future,
+                                   video_path: str, audio_path: str, 
+                                   transcript_path: str, config: Dict[str, Any], 
+                                   enable_diarization: bool, progress_bar, status_text,
+                                   audio_ready: bool = False) -> Optional[str]:
+        """Process audio extraction and transcription. Returns the transcript, or None on failure."""
+        # Step 5: Extract audio (skipped when the audio was downloaded directly)
+        if not audio_ready:
+            status_text.text("🎵 오디오를 추출하는 중...")
+            progress_bar.progress(55)
+            
+            success, message = audio_processor.extract_audio(video_path, audio_path)
+            if not success:
+                st.error(message)
+                return None
         
-        success, message = audio_processor.extract_audio(video_path, audio_path)
-        if not success:
-            st.error(message)
-            return
+        # Decode once; diarization and Whisper both reuse the samples
+        audio = audio_processor.load_audio(audio_path)
         
         # Step 6: Load models
         status_text.text("🤖 AI 모델을 로드하는 중...")
         progress_bar.progress(65)
-        audio_processor.load_models()
+        model_future.result()  # started in the background at the top of the pipeline
         
-        # Step 7: Speaker diarization (optional)
+        # Step 7 + 8: Speaker diarization (optional) and speech recognition
         diarization = None
-        if enable_diarization:
-            status_text.text("👥 화자분리를 수행하는 중...")
+        if enable_diarization and audio_processor.device == "cuda":
+            # Independent models on separate CUDA streams: overlap diarization with Whisper
+            status_text.text("👥🎙️ 화자분리와 음성인식을 동시에 수행하는 중...")
             progress_bar.progress(75)
-            diarization = audio_processor.perform_diarization(audio_path)
-
-        # Step 8: Speech recognition
-        status_text.text("🎙️ 음성인식을 수행하는 중...")
-        progress_bar.progress(85)
+            diarization_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            diarization_future = diarization_executor.submit(
+                self._diarize_with_context, audio_processor, audio_path, audio, get_script_run_ctx()
+            )
+            diarization_executor.shutdown(wait=False)
+            whisper_result, error = audio_processor.transcribe_with_whisper(audio_path, audio)
+            diarization = diarization_future.result()
+        else:
+            # Whisper first: its segments tell whether diarization is needed at all
+            status_text.text("🎙️ 음성인식을 수행하는 중...")
+            progress_bar.progress(75)
+            whisper_result, error = audio_processor.transcribe_with_whisper(audio_path, audio)
+            
+            if enable_diarization and not error:
+                if audio_processor.needs_diarization(whisper_result, audio):
+                    status_text.text("👥 화자분리를 수행하는 중...")
+                    progress_bar.progress(85)
+                    diarization = audio_processor.perform_diarization(audio_path, audio=audio)
+                else:
+                    st.info("발화 구간이 적어 화자분리를 건너뜁니다.")
+                    diarization = []
         
-        whisper_result, error = audio_processor.transcribe_with_whisper(audio_path)
         if error:
             st.error(error)
-            return
+            return None
         
         # Step 9: Generate transcript (without chat)
         status_text.text("📝 트랜스크립트를 생성하는 중...")
@@ -713,27 +1020,29 @@ class TranscriptionApp:
         else:
             transcript = audio_processor.create_transcript(whisper_result, diarization)
         
-        # Save transcript (without chat)
-        with open(transcript_path, 'w', encoding='utf-8') as f:
-            f.write(transcript)
+        # Save transcript (without chat); keep the encoded bytes for the download button
+        transcript_bytes = transcript.encode('utf-8')
+        with open(transcript_path, 'wb') as f:
+            f.write(transcript_bytes)
+        st.session_state['transcript_bytes'] = transcript_bytes
         
         # Complete
         progress_bar.progress(100)
         status_text.text("✅ 완료!")
         
-        # Display results
-        self._display_results(transcript, transcript_path, chat_path, chat_messages)
+        return transcript
 
     def _display_results(self, transcript: str, transcript_path: str, 
-                        chat_path: Optional[str], chat_messages: List[str]):
+                        chat_path: Optional[str], chat_messages: List[Tuple[int, str]]):
         """Display processing results."""
         st.success("트랜스크립트 생성이 완료되었습니다!")
         
         # Video information
         with st.expander("📋 비디오 정보", expanded=True):
-            video_url = st.session_state.get('video_url', '')
-            start_time = st.session_state.get('start_time', '')
-            end_time = st.session_state.get('end_time', '')
+            ss = st.session_state
+            video_url = ss.get('video_url', '')
+            start_time = ss.get('start_time', '')
+            end_time = ss.get('end_time', '')
             
             st.write(f"**영상 URL:** {video_url}")
             st.write(f"**구간:** {start_time} - {end_time}")
@@ -747,7 +1056,7 @@ class TranscriptionApp:
         # Chat display (if available)
         if chat_messages:
             with st.expander("💬 채팅 로그", expanded=False):
-                st.text_area("", '\n'.join(chat_messages), height=300)
+                st.text_area("", '\n'.join(msg for _, msg in chat_messages), height=300)
         
         # Synchronized display (if chat available)
         if chat_messages:
@@ -758,58 +1067,41 @@ class TranscriptionApp:
         # Download buttons
         col1, col2 = st.columns(2)
         
+        # Serve the bytes kept in session state instead of re-reading the files
         with col1:
-            with open(transcript_path, 'rb') as f:
+            st.download_button(
+                label="📄 트랜스크립트 다운로드",
+                data=st.session_state.get('transcript_bytes') or transcript.encode('utf-8'),
+                file_name=os.path.basename(transcript_path),
+                mime="text/plain"
+            )
+        
+        with col2:
+            chat_bytes = st.session_state.get('chat_bytes')
+            if chat_messages and chat_path and chat_bytes:
                 st.download_button(
-                    label="📄 트랜스크립트 다운로드",
-                    data=f.read(),
-                    file_name=os.path.basename(transcript_path),
+                    label="💬 채팅 로그 다운로드",
+                    data=chat_bytes,
+                    file_name=os.path.basename(chat_path),
                     mime="text/plain"
                 )
-        
-        with col2:
-            if chat_messages and chat_path and os.path.exists(chat_path):
-                with open(chat_path, 'rb') as f:
-                    st.download_button(
-                        label="💬 채팅 로그 다운로드",
-                        data=f.read(),
-                        file_name=os.path.basename(chat_path),
-                        mime="text/plain"
-                    )
-
-    def _create_synchronized_content(self, transcript: str, chat_messages: List[str]) -> str:
+
+    def _create_synchronized_content(self, transcript: str,
+                                     chat_messages: List[Tuple[int, str]]) -> str:
         """트랜스크립트와 채팅을 시간순으로 동기화하여 병합"""
-        import re
-        
-        # 트랜스크립트에서 타임스탬프 추출
+        # 트랜스크립트에서 타임스탬프 추출 (전체 문자열을 한 번만 스캔)
         transcript_lines = []
-        for line in transcript.split('\n'):
-            time_match = re.search(r'(\d{2}:\d{2}:\d{2})', line)
-            if time_match:
-                time_str = time_match.group(1)
-                h, m, s = map(int, time_str.split(':'))
-                time_seconds = h * 3600 + m * 60 + s
-                transcript_lines.append((time_seconds, f"[음성] {line}"))
-        
-        # 채팅에서 타임스탬프 추출
-        chat_lines = []
-        for chat_msg in chat_messages:
-            time_match = re.search(r'\[(\d{2}):(\d{2}):(\d{2})\]', chat_msg)
-            if time_match:
-                h, m, s = map(int, time_match.groups())
-                time_seconds = h * 3600 + m * 60 + s
-                chat_lines.append((time_seconds, f"[채팅] {chat_msg}"))
-        
-        # 시간순으로 병합
-        all_lines = transcript_lines + chat_lines
-        all_lines.sort(key=lambda x: x[0])
-        
-        # 결과 생성
-        result = []
-        for _, content in all_lines:
-            result.append(content)
-        
-        return '\n'.join(result)
+        for match in _TRANSCRIPT_TS_RE.finditer(transcript):
+            h, m, s = match.groups()
+            time_seconds = int(h) * 3600 + int(m) * 60 + int(s)
+            transcript_lines.append((time_seconds, f"[음성] {match.group(0)}"))
+        
+        # 채팅은 수집 시 계산한 초 단위 시각을 그대로 사용
+        chat_lines = [(seconds, f"[채팅] {msg}") for seconds, msg in chat_messages]
+        
+        # 시간순으로 병합 (두 목록 모두 이미 시간순이므로 다시 정렬하지 않음,
+        # 같은 시각이면 음성 줄이 먼저 오는 기존 순서 유지)
+        return '\n'.join(content for _, content in merge(transcript_lines, chat_lines, key=itemgetter(0)))
 
     def run(self):
         """Run the main application."""
@@ -4,10 +4,13 @@ Supports faster-whisper (primary) and openai-whisper (fallback).
 Supports WeSpeaker (no auth), simple-diarizer (no auth), and pyannote (HuggingFace token).
 """
 import ffmpeg
+import numpy as np
 import torch
 import time
-from typing import Optional, Tuple, Dict, Any, List
-from utils import format_time
+import threading
+import concurrent.futures
+from contextlib import nullcontext
+from typing import Optional, Tuple, Dict, Any, List, Union, Iterator
 
 # Whisper backends
 FASTER_WHISPER_AVAILABLE = False
@@ -45,17 +48,22 @@ except Exception:
 
 try:
     from pyannote.audio import Pipeline
+    import torchaudio  # installed with pyannote.audio
     PYANNOTE_AVAILABLE = True
 except Exception:
     pass
 
 try:
     import streamlit as st
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
     STREAMLIT_AVAILABLE = True
 except ImportError:
     STREAMLIT_AVAILABLE = False
 
 
+# Sample rate expected by Whisper and the diarization models
+SAMPLE_RATE = 16000
+
 # Whisper model options for UI
 WHISPER_MODELS = {
     "large-v3": "최고 정확도 (VRAM ~10GB)",
@@ -83,6 +91,12 @@ if not DIARIZATION_BACKENDS:
 class AudioProcessor:
     """Handles audio extraction, transcription, and speaker diarization."""
 
+    # Whisper segments per block when computing segment × turn overlaps
+    SPEAKER_ASSIGN_BLOCK = 256
+    # Below these, diarization is skipped and every segment is attributed to one speaker
+    MIN_DIARIZATION_SEGMENTS = 5
+    MIN_DIARIZATION_SPEECH_RATIO = 0.1
+
     def __init__(self, whisper_model: str = "large-v3-turbo",
                  hf_token: Optional[str] = None,
                  diarization_backend: str = "auto",
@@ -94,6 +108,11 @@ class AudioProcessor:
         self.device = self._get_device()
         self.whisper = None
         self.diarization_pipeline = None
+        # One instance is shared across sessions and loader threads (get_audio_processor);
+        # serializes load_models so concurrent runs neither load twice nor race on the attributes
+        self._load_lock = threading.Lock()
+        # (owner, attribute, eager module) for each pyannote model replaced by torch.compile
+        self._eager_pyannote_models: List[Tuple[Any, str, torch.nn.Module]] = []
 
         # Auto-select diarization backend
         if self.diarization_backend == "auto":
@@ -133,27 +152,56 @@ class AudioProcessor:
         return DIARIZATION_BACKENDS.get(self.diarization_backend, "없음")
 
     def load_models(self) -> None:
-        """Load Whisper and speaker diarization models."""
-        # Load Whisper
+        """Load Whisper and speaker diarization models (concurrently when both are needed)."""
+        with self._load_lock:
+            diarization_future = None
+            if (self.diarization_pipeline is None and self.whisper is None
+                    and self.diarization_backend != "none"):
+                # Independent weights: load the diarization model on a second thread while Whisper loads here
+                ctx = get_script_run_ctx(suppress_warning=True) if STREAMLIT_AVAILABLE else None
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+                diarization_future = executor.submit(self._load_diarization_model_with_context, ctx)
+                executor.shutdown(wait=False)
+
+            try:
+                self._load_whisper()
+            finally:
+                if diarization_future is not None:
+                    diarization_future.result()
+
+            if self.diarization_pipeline is None and diarization_future is None:
+                self._load_diarization_model()
+
+            if self.device == "cuda":
+                # Diarization models see fixed-size windows, so cuDNN can pick the fastest kernels once
+                torch.backends.cudnn.benchmark = True
+
+    def _load_diarization_model_with_context(self, ctx) -> None:
+        """Worker-thread entry for _load_diarization_model that keeps st.info/st.warning working."""
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        self._load_diarization_model()
+
+    def _load_whisper(self) -> None:
+        """Load the Whisper model if it is not loaded yet."""
         if self.whisper is None:
             if STREAMLIT_AVAILABLE:
                 backend = self.get_whisper_backend_info()
                 st.info(f"Whisper 모델 로딩 중... ({self.whisper_model_name}, {backend}, {self.device})")
 
             if FASTER_WHISPER_AVAILABLE:
-                compute_type = "float16" if self.device == "cuda" else "int8"
+                # int8 weights with float16 activations on CUDA; int8 on CPU
+                compute_type = "int8_float16" if self.device == "cuda" else "int8"
                 self.whisper = WhisperModel(
                     self.whisper_model_name,
                     device=self.device if self.device != "mps" else "cpu",
                     compute_type=compute_type
                 )
             elif OPENAI_WHISPER_AVAILABLE:
+                # Not dynamically quantized: its layers are whisper.model.Linear, a subclass
+                # that quantize_dynamic's exact type match skips (and nnqd.Linear rejects)
                 self.whisper = whisper.load_model(self.whisper_model_name, device=self.device)
 
-        # Load diarization
-        if self.diarization_pipeline is None:
-            self._load_diarization_model()
-
     def _load_diarization_model(self) -> None:
         """Load the selected diarization backend."""
         if self.diarization_backend == "wespeaker":
@@ -186,20 +234,101 @@ class AudioProcessor:
                     "pyannote/speaker-diarization-3.1",
                     use_auth_token=self.hf_token
                 )
-                if self.use_gpu and torch.cuda.is_available():
-                    pipeline = pipeline.to(torch.device("cuda"))
+                if self.device != "cpu":
+                    pipeline = self._move_pyannote_to_device(pipeline)
+                self._set_pyannote_batch_sizes(pipeline)
+                if self.device == "cuda":
+                    self._compile_pyannote_models(pipeline)
+                elif self.device == "cpu":
+                    # Segmentation is LSTM + Linear, which dynamic int8 quantization covers
+                    segmentation = getattr(pipeline, "_segmentation", None)
+                    if isinstance(getattr(segmentation, "model", None), torch.nn.Module):
+                        segmentation.model = self._quantize_dynamic(
+                            segmentation.model, {torch.nn.LSTM, torch.nn.Linear}
+                        )
                 self.diarization_pipeline = ("pyannote", pipeline)
             except Exception as e:
                 if STREAMLIT_AVAILABLE:
                     st.warning(f"Pyannote 로드 실패: {e}")
 
+    def _move_pyannote_to_device(self, pipeline):
+        """Move a pyannote pipeline to self.device (CUDA or MPS), keeping it on CPU if that fails."""
+        try:
+            pipeline = pipeline.to(torch.device(self.device))
+        except Exception as e:
+            # pyannote's MPS support is partial; diarization still works on CPU
+            if STREAMLIT_AVAILABLE:
+                st.warning(f"Pyannote를 {self.device}로 옮기지 못해 CPU에서 실행합니다: {e}")
+            return pipeline
+
+        # pyannote has silently left weights on CPU in some versions; check the segmentation model
+        segmentation = getattr(getattr(pipeline, "_segmentation", None), "model", None)
+        if segmentation is not None:
+            param = next(segmentation.parameters(), None)
+            if param is not None and param.device.type != self.device and STREAMLIT_AVAILABLE:
+                st.warning(f"Pyannote 모델이 {self.device}가 아닌 {param.device.type}에서 실행됩니다.")
+        return pipeline
+
+    def _set_pyannote_batch_sizes(self, pipeline) -> None:
+        """Size pyannote's segmentation/embedding batches for the device it runs on."""
+        if self.device == "cuda":
+            total_memory = torch.cuda.get_device_properties(0).total_memory
+            batch_size = 64 if total_memory >= 16 * 1024 ** 3 else 32
+        else:
+            # Large batches only add memory pressure on CPU/MPS without improving throughput
+            batch_size = 8
+
+        for attr in ("segmentation_batch_size", "embedding_batch_size"):
+            if hasattr(pipeline, attr):
+                setattr(pipeline, attr, batch_size)
+
+    def _quantize_dynamic(self, model, layer_types: set):
+        """Dynamically quantize the given layer types to int8 for CPU inference; returns model unchanged on failure."""
+        try:
+            return torch.quantization.quantize_dynamic(model, layer_types, dtype=torch.qint8)
+        except Exception as e:
+            if STREAMLIT_AVAILABLE:
+                st.warning(f"int8 양자화를 건너뜁니다: {e}")
+            return model
+
+    def _compile_pyannote_models(self, pipeline) -> None:
+        """torch.compile pyannote's segmentation and embedding networks (PyTorch 2.x, CUDA)."""
+        if not hasattr(torch, "compile"):
+            return
+
+        # Default mode rather than "reduce-overhead": CUDA graphs do not mix with the
+        # side stream / worker thread diarization runs on. The first call pays the compile.
+        # torch.compile is lazy, so backend/Dynamo errors only surface on that call;
+        # the eager modules are kept for _restore_eager_pyannote_models.
+        for owner_attr, model_attr in (("_segmentation", "model"), ("_embedding", "model_")):
+            owner = getattr(pipeline, owner_attr, None)
+            model = getattr(owner, model_attr, None)
+            if not isinstance(model, torch.nn.Module):
+                continue
+            try:
+                setattr(owner, model_attr, torch.compile(model))
+            except Exception as e:
+                if STREAMLIT_AVAILABLE:
+                    st.warning(f"Pyannote 모델 컴파일을 건너뜁니다: {e}")
+                continue
+            self._eager_pyannote_models.append((owner, model_attr, model))
+
+    def _restore_eager_pyannote_models(self) -> bool:
+        """Swap compiled pyannote models back to their eager modules; False if none were compiled."""
+        if not self._eager_pyannote_models:
+            return False
+        for owner, model_attr, model in self._eager_pyannote_models:
+            setattr(owner, model_attr, model)
+        self._eager_pyannote_models = []
+        return True
+
     def extract_audio(self, video_path: str, audio_path: str) -> Tuple[bool, str]:
         """Extract audio from video file."""
         try:
             (
                 ffmpeg
                 .input(video_path)
-                .output(audio_path, acodec='pcm_s16le', ac=1, ar='16000')
+                .output(audio_path, acodec='pcm_s16le', ac=1, ar=str(SAMPLE_RATE))
                 .overwrite_output()
                 .run(quiet=True)
             )
@@ -207,9 +336,29 @@ class AudioProcessor:
         except Exception as e:
             return False, f"오디오 추출 실패: {str(e)}"
 
-    def perform_diarization(self, audio_path: str, num_speakers: Optional[int] = None) -> Optional[List[Dict]]:
+    def load_audio(self, audio_path: str) -> Optional[np.ndarray]:
+        """
+        Decode audio once into a 16 kHz mono float32 array.
+        Whisper and pyannote accept the array directly, so neither re-decodes the file.
+        Returns None on failure; callers then fall back to passing the path.
+        """
+        try:
+            out, _ = (
+                ffmpeg
+                .input(audio_path)
+                .output('pipe:', format='s16le', acodec='pcm_s16le', ac=1, ar=str(SAMPLE_RATE))
+                .run(capture_stdout=True, quiet=True)
+            )
+            return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+        except Exception:
+            return None
+
+    def perform_diarization(self, audio_path: str, num_speakers: Optional[int] = None,
+                            audio: Optional[np.ndarray] = None) -> Optional[List[Dict]]:
         """
         Perform speaker diarization on audio file.
+        If audio (from load_audio) is given, pyannote uses it instead of decoding the file;
+        WeSpeaker and Simple Diarizer only take file paths.
         Returns normalized list of segments: [{'start': float, 'end': float, 'speaker': str}, ...]
         """
         if self.diarization_pipeline is None:
@@ -218,17 +367,36 @@ class AudioProcessor:
         backend_type, model = self.diarization_pipeline
 
         try:
-            if backend_type == "wespeaker":
-                return self._diarize_wespeaker(model, audio_path)
-            elif backend_type == "simple":
-                return self._diarize_simple(model, audio_path, num_speakers)
-            elif backend_type == "pyannote":
-                return self._diarize_pyannote(model, audio_path, num_speakers)
+            # All diarization backends are PyTorch models; skip autograd bookkeeping.
+            # On CUDA use a dedicated stream so diarization can overlap with Whisper.
+            stream = torch.cuda.stream(torch.cuda.Stream()) if self.device == "cuda" else nullcontext()
+            with torch.inference_mode(), stream:
+                if backend_type == "wespeaker":
+                    return self._diarize_wespeaker(model, audio_path)
+                elif backend_type == "simple":
+                    return self._diarize_simple(model, audio_path, num_speakers)
+                elif backend_type == "pyannote":
+                    return self._diarize_pyannote(model, audio_path, num_speakers, audio)
         except Exception as e:
             if STREAMLIT_AVAILABLE:
                 st.warning(f"화자분리 실패: {str(e)}")
             return None
 
+    def needs_diarization(self, whisper_result: Dict[str, Any],
+                          audio: Optional[np.ndarray] = None) -> bool:
+        """
+        Decide from Whisper's (VAD-filtered) segments whether diarization is worth running.
+        Too few segments or too little speech cannot yield a meaningful speaker split.
+        """
+        segments = whisper_result['segments']
+        if len(segments) < self.MIN_DIARIZATION_SEGMENTS:
+            return False
+        if audio is not None and len(audio):
+            speech = sum(seg['end'] - seg['start'] for seg in segments)
+            if speech / (len(audio) / SAMPLE_RATE) < self.MIN_DIARIZATION_SPEECH_RATIO:
+                return False
+        return True
+
     def _diarize_wespeaker(self, model, audio_path: str) -> Optional[List[Dict]]:
         """Diarize using WeSpeaker."""
         if STREAMLIT_AVAILABLE:
@@ -281,7 +449,8 @@ class AudioProcessor:
         return segments
 
     def _diarize_pyannote(self, pipeline, audio_path: str,
-                          num_speakers: Optional[int] = None) -> Optional[List[Dict]]:
+                          num_speakers: Optional[int] = None,
+                          audio: Optional[np.ndarray] = None) -> Optional[List[Dict]]:
         """Diarize using pyannote."""
         if STREAMLIT_AVAILABLE:
             st.info("Pyannote 화자분리 진행 중...")
@@ -290,7 +459,24 @@ class AudioProcessor:
         if num_speakers:
             kwargs['num_speakers'] = num_speakers
 
-        diarization = pipeline(audio_path, **kwargs)
+        # Decode once and hand pyannote the waveform; given a path it re-opens and
+        # re-decodes the file for every sliding-window chunk it crops.
+        if audio is not None:
+            waveform, sample_rate = torch.from_numpy(audio).unsqueeze(0), SAMPLE_RATE
+        else:
+            waveform, sample_rate = torchaudio.load(audio_path)
+        # FP16 autocast on CUDA for the segmentation/embedding models; CPU/MPS stay FP32
+        with torch.autocast(device_type="cuda", dtype=torch.float16, enabled=self.device == "cuda"):
+            try:
+                diarization = pipeline({"waveform": waveform, "sample_rate": sample_rate}, **kwargs)
+            except Exception as e:
+                # A failing compiled model would break every later run of this shared
+                # processor; fall back to the eager models and retry once
+                if not self._restore_eager_pyannote_models():
+                    raise
+                if STREAMLIT_AVAILABLE:
+                    st.warning(f"컴파일된 Pyannote 모델 실행에 실패해 기본 모델로 다시 시도합니다: {e}")
+                diarization = pipeline({"waveform": waveform, "sample_rate": sample_rate}, **kwargs)
 
         segments = []
         for turn, _, speaker in diarization.itertracks(yield_label=True):
@@ -306,19 +492,24 @@ class AudioProcessor:
 
         return segments
 
-    def transcribe_with_whisper(self, audio_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
-        """Transcribe audio using Whisper. Returns normalized result dict."""
+    def transcribe_with_whisper(self, audio_path: str,
+                                audio: Optional[np.ndarray] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Transcribe audio using Whisper. Returns normalized result dict.
+        If audio (from load_audio) is given it is used instead of decoding the file again.
+        """
+        source = audio if audio is not None else audio_path
         try:
             if FASTER_WHISPER_AVAILABLE and isinstance(self.whisper, WhisperModel):
-                return self._transcribe_faster_whisper(audio_path)
+                return self._transcribe_faster_whisper(source)
             elif OPENAI_WHISPER_AVAILABLE:
-                return self._transcribe_openai_whisper(audio_path)
+                return self._transcribe_openai_whisper(source)
             else:
                 return None, "Whisper 모델이 로드되지 않았습니다."
         except Exception as e:
             return None, f"음성인식 실패: {str(e)}"
 
-    def _transcribe_faster_whisper(self, audio_path: str) -> Tuple[Optional[Dict], Optional[str]]:
+    def _transcribe_faster_whisper(self, audio_path: Union[str, np.ndarray]) -> Tuple[Optional[Dict], Optional[str]]:
         """Transcribe using faster-whisper."""
         segments_gen, info = self.whisper.transcribe(
             audio_path,
@@ -345,110 +536,148 @@ class AudioProcessor:
         }
         return result, None
 
-    def _transcribe_openai_whisper(self, audio_path: str) -> Tuple[Optional[Dict], Optional[str]]:
+    def _transcribe_openai_whisper(self, audio_path: Union[str, np.ndarray]) -> Tuple[Optional[Dict], Optional[str]]:
         """Transcribe using openai-whisper (fallback)."""
         transcribe_options = {
             "language": "ko",
-            "fp16": self.device == "cuda"
+            "fp16": self.device == "cuda",
+            # Temperature fallback in 0.2 steps (the first pass is greedy/beam at 0.0)
+            "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
         }
-        result = self.whisper.transcribe(audio_path, **transcribe_options)
+        if self.device == "cuda":
+            # Beam search costs about the same wall time as greedy on CUDA; MPS/CPU stay greedy
+            transcribe_options.update(beam_size=5, best_of=5)
+        with torch.inference_mode():
+            result = self.whisper.transcribe(audio_path, **transcribe_options)
         return result, None
 
     def create_transcript(self, whisper_result: Dict[str, Any],
                           diarization: Optional[List[Dict]] = None) -> str:
         """Create formatted transcript from Whisper results and optional diarization."""
+        return "\n".join(self._transcript_lines(whisper_result, diarization))
+
+    def _transcript_lines(self, whisper_result: Dict[str, Any],
+                          diarization: Optional[List[Dict]] = None) -> Iterator[str]:
+        """Yield the lines of the plain-text transcript."""
         segments = whisper_result['segments']
+        start_strs = self._format_times([seg['start'] for seg in segments])
+        end_strs = self._format_times([seg['end'] for seg in segments])
 
         if diarization is None:
-            transcript = []
-            for segment in segments:
-                start_time = format_time(segment['start'])
-                end_time = format_time(segment['end'])
-                text = segment['text'].strip()
-                transcript.append(f"[{start_time} - {end_time}] {text}")
-            return "\n".join(transcript)
+            for segment, start_time, end_time in zip(segments, start_strs, end_strs):
+                yield f"[{start_time} - {end_time}] {segment['text'].strip()}"
+            return
 
         # Transcript with speaker diarization
-        speaker_mapping = {}
-        next_speaker_id = 1
-
-        transcript = []
-        for segment in segments:
-            start_time = segment['start']
-            end_time = segment['end']
-            text = segment['text'].strip()
-
-            raw_speaker = self._find_speaker_at_time(diarization, start_time, end_time)
-
-            if raw_speaker not in speaker_mapping:
-                speaker_mapping[raw_speaker] = f"화자{next_speaker_id}"
-                next_speaker_id += 1
-
-            speaker = speaker_mapping[raw_speaker]
-            start_time_str = format_time(start_time)
-            end_time_str = format_time(end_time)
-            transcript.append(f"[{start_time_str} - {end_time_str}] {speaker}: {text}")
-
+        speakers = self._assign_speakers(segments, diarization)
         if STREAMLIT_AVAILABLE:
-            st.info(f"화자 매핑: {len(speaker_mapping)}명 ({', '.join(speaker_mapping.values())})")
-
-        return "\n".join(transcript)
-
-    def _find_speaker_at_time(self, diarization: List[Dict],
-                              start_time: float, end_time: float) -> str:
-        """Find the most likely speaker for a given time segment."""
-        best_overlap = 0
-        best_speaker = "UNKNOWN"
+            labels = list(dict.fromkeys(speakers))
+            st.info(f"화자 매핑: {len(labels)}명 ({', '.join(labels)})")
 
-        for seg in diarization:
-            overlap_start = max(seg['start'], start_time)
-            overlap_end = min(seg['end'], end_time)
-            overlap = max(0, overlap_end - overlap_start)
+        for segment, speaker, start_time, end_time in zip(segments, speakers, start_strs, end_strs):
+            yield f"[{start_time} - {end_time}] {speaker}: {segment['text'].strip()}"
 
-            if overlap > best_overlap:
-                best_overlap = overlap
-                best_speaker = seg['speaker']
-
-        return best_speaker
+    def _assign_speakers(self, segments: List[Dict], diarization: List[Dict]) -> List[str]:
+        """
+        Label each Whisper segment with the speaker of the largest-overlapping turn,
+        renamed to 화자1, 화자2, ... in order of first appearance (shared by both formats).
+        Computes segment × turn overlaps with NumPy broadcasting, in blocks of
+        segments to bound the size of the overlap matrix.
+        """
+        if not segments:
+            return []
+        if not diarization:
+            return ["화자1"] * len(segments)
+
+        turns = sorted(diarization, key=lambda seg: seg['start'])
+        # Intern raw labels to small ints; id len(label_ids) stands for "no overlapping turn"
+        label_ids = {}
+        turn_spk_ids = np.fromiter(
+            (label_ids.setdefault(seg['speaker'], len(label_ids)) for seg in turns),
+            dtype=np.int32, count=len(turns)
+        )
+        unknown_id = len(label_ids)
+        turn_starts = np.fromiter((seg['start'] for seg in turns), dtype=np.float64, count=len(turns))
+        turn_ends = np.fromiter((seg['end'] for seg in turns), dtype=np.float64, count=len(turns))
+        seg_starts = np.fromiter((seg['start'] for seg in segments), dtype=np.float64, count=len(segments))
+        seg_ends = np.fromiter((seg['end'] for seg in segments), dtype=np.float64, count=len(segments))
+
+        seg_spk_ids = np.empty(len(segments), dtype=np.int32)
+        for lo in range(0, len(segments), self.SPEAKER_ASSIGN_BLOCK):
+            hi = lo + self.SPEAKER_ASSIGN_BLOCK
+            overlap = (np.minimum(seg_ends[lo:hi, None], turn_ends[None, :])
+                       - np.maximum(seg_starts[lo:hi, None], turn_starts[None, :]))
+            # argmax takes the first turn on ties, matching the earlier strict ">" scan
+            best = overlap.argmax(axis=1)
+            best_overlap = overlap[np.arange(len(best)), best]
+            seg_spk_ids[lo:hi] = np.where(best_overlap > 0, turn_spk_ids[best], unknown_id)
+
+        # Rename table indexed by speaker id, numbered by first appearance in the transcript
+        unique_ids, first_index = np.unique(seg_spk_ids, return_index=True)
+        rename = [""] * (unknown_id + 1)
+        for rank, spk in enumerate(unique_ids[np.argsort(first_index)].tolist(), 1):
+            rename[spk] = f"화자{rank}"
+        return [rename[spk] for spk in seg_spk_ids.tolist()]
 
     def create_srt_transcript(self, whisper_result: Dict[str, Any],
                               diarization: Optional[List[Dict]] = None) -> str:
         """Create SRT format transcript."""
-        segments = whisper_result['segments']
-        srt_content = []
+        return "\n".join(self._srt_lines(whisper_result, diarization))
 
-        speaker_mapping = {}
-        next_speaker_id = 1
+    def _srt_lines(self, whisper_result: Dict[str, Any],
+                   diarization: Optional[List[Dict]] = None) -> Iterator[str]:
+        """Yield the lines of the SRT transcript (four per segment, blank line last)."""
+        segments = whisper_result['segments']
+        # [] (diarization skipped) labels every line 화자1, as the plain-text transcript does
+        speakers = self._assign_speakers(segments, diarization) if diarization is not None else None
+        start_strs = self._format_times([seg['start'] for seg in segments], srt=True)
+        end_strs = self._format_times([seg['end'] for seg in segments], srt=True)
 
         for i, segment in enumerate(segments, 1):
-            start_time = segment['start']
-            end_time = segment['end']
             text = segment['text'].strip()
 
-            if diarization:
-                raw_speaker = self._find_speaker_at_time(diarization, start_time, end_time)
-                if raw_speaker not in speaker_mapping:
-                    speaker_mapping[raw_speaker] = f"화자{next_speaker_id}"
-                    next_speaker_id += 1
-                speaker = speaker_mapping[raw_speaker]
-                text = f"{speaker}: {text}"
-
-            start_srt = self._seconds_to_srt_time(start_time)
-            end_srt = self._seconds_to_srt_time(end_time)
-
-            srt_content.append(f"{i}")
-            srt_content.append(f"{start_srt} --> {end_srt}")
-            srt_content.append(text)
-            srt_content.append("")
-
-        return "\n".join(srt_content)
-
-    def _seconds_to_srt_time(self, seconds: float) -> str:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        milliseconds = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+            if speakers is not None:
+                text = f"{speakers[i - 1]}: {text}"
+
+            yield f"{i}"
+            yield f"{start_strs[i - 1]} --> {end_strs[i - 1]}"
+            yield text
+            yield ""
+
+    def write_transcript(self, path: str, whisper_result: Dict[str, Any],
+                         diarization: Optional[List[Dict]] = None,
+                         output_format: str = "txt") -> None:
+        """
+        Write the transcript straight to disk line by line, without building the
+        whole text in memory. Produces the same content as create_transcript /
+        create_srt_transcript.
+        """
+        if output_format == "srt":
+            lines = self._srt_lines(whisper_result, diarization)
+        else:
+            lines = self._transcript_lines(whisper_result, diarization)
+
+        with open(path, "w", encoding="utf-8") as f:
+            for i, line in enumerate(lines):
+                if i:
+                    f.write("\n")
+                f.write(line)
+
+    def _format_times(self, seconds: List[float], srt: bool = False) -> List[str]:
+        """
+        Format all timestamps of a transcript in one batch.
+        HH:MM:SS (same as utils.format_time), or HH:MM:SS,mmm for SRT.
+        """
+        t = np.asarray(seconds, dtype=np.float64)
+        hours, rem = np.divmod(t.astype(np.int64), 3600)
+        minutes, secs = np.divmod(rem, 60)
+        hms = zip(hours.tolist(), minutes.tolist(), secs.tolist())
+
+        if not srt:
+            return [f"{h:02d}:{m:02d}:{s:02d}" for h, m, s in hms]
+
+        milliseconds = ((t % 1) * 1000).astype(np.int64).tolist()
+        return [f"{h:02d}:{m:02d}:{s:02d},{ms:03d}" for (h, m, s), ms in zip(hms, milliseconds)]
 
     def is_diarization_available(self) -> bool:
         """Check if speaker diarization is available."""
@@ -2,18 +2,32 @@
 CHZZK video downloader with enhanced features for various video formats and cookie support.
 """
 import re
-import time
+import functools
+import threading
+import itertools
+import concurrent.futures
+from collections import deque
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+from http.cookiejar import DefaultCookiePolicy
 import os
-from typing import Dict, List, Optional, Tuple, Union, Callable, Any
+import shutil
+import subprocess
+from typing import Dict, Iterator, List, Optional, Tuple, Union, Callable, Any
 from utils import clean_filename
 
+# The downloader drives the ffmpeg binary directly with a prebuilt argv
+FFMPEG_AVAILABLE = shutil.which("ffmpeg") is not None
+
+# lxml parses and queries the DASH manifest in C; the stdlib API is the same subset we use
 try:
-    import ffmpeg
-    FFMPEG_AVAILABLE = True
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
 except ImportError:
-    FFMPEG_AVAILABLE = False
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
 
 
 class ChzzkDownloader:
@@ -25,13 +39,92 @@ class ChzzkDownloader:
     
     # Enhanced User-Agent for better compatibility
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+
+    # CHZZK VOD URL, desktop or mobile host, optional query/fragment
+    _VIDEO_URL_RE = re.compile(r'https?://(?:m\.)?chzzk\.naver\.com/video/(?P<video_no>\d+)(?:[?#].*)?$')
+    _QUALITY_RE = re.compile(r'(\d+)p?')
+    # FFmpeg -progress lines, matched on the raw stderr bytes
+    _OUT_TIME_MS_RE = re.compile(rb'out_time_ms=(\d+)')
+    _OUT_TIME_RE = re.compile(rb'out_time=(\d+):(\d+):(\d+)(\.\d+)')
+    _STDERR_CHUNK = 65536
+    # Keywords marking the stderr lines worth showing when FFmpeg fails
+    _ERROR_LINE_RE = re.compile(rb'error|failed|invalid|not found|forbidden|http', re.IGNORECASE)
+
+    # DASH manifest tags in Clark notation, so lookups skip prefix resolution
+    _MPD_NS = "{urn:mpeg:dash:schema:mpd:2011}"
+    _MPD_ADAPTATION_SET = _MPD_NS + "AdaptationSet"
+    _MPD_REPRESENTATION = _MPD_NS + "Representation"
+    _MPD_BASE_URL = _MPD_NS + "BaseURL"
+
+    # FFmpeg HTTP input options shared by the stream download methods
+    _FFMPEG_HEADERS = f'Referer: https://chzzk.naver.com/\r\nUser-Agent: {USER_AGENT}'
+    _FFMPEG_HTTP_INPUT = (
+        '-user_agent', USER_AGENT,
+        '-headers', _FFMPEG_HEADERS,
+        '-reconnect', '1',
+        '-reconnect_streamed', '1',
+    )
+    # Output options of the stream-copy methods (1 and 2) and the re-encoding method 3
+    _FFMPEG_COPY_OUTPUT = ('-c', 'copy', '-avoid_negative_ts', 'make_zero')
+    _FFMPEG_REENCODE_OUTPUT = ('-vcodec', 'libx264', '-acodec', 'aac', '-preset', 'fast', '-crf', '23')
+    _FFMPEG_UA_HEADER = f'User-Agent: {USER_AGENT}'
+
+    # Chunk size for piping the method 4 HTTP body into FFmpeg
+    HTTP_CHUNK_SIZE = 1 << 20
+    # Method 4 parallel range fetch: piece size and pieces in flight (one pooled connection each)
+    RANGE_CHUNK_SIZE = 8 << 20
+    RANGE_WORKERS = 4
+    _CONTENT_RANGE_RE = re.compile(r'bytes \d+-\d+/(\d+)')
+
+    # Shared keep-alive session (created lazily by get_session)
+    _session: Optional[requests.Session] = None
+
+    @staticmethod
+    def get_session() -> requests.Session:
+        """Return the shared pooled session used for CHZZK API and CDN requests."""
+        if ChzzkDownloader._session is None:
+            session = requests.Session()
+            # All retrying happens here: exponential backoff, honors Retry-After on 429/503
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": ChzzkDownloader.USER_AGENT,
+                "Referer": "https://chzzk.naver.com/"
+            })
+            # Shared by all users: never store Set-Cookie responses, cookies go per request
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            ChzzkDownloader._session = session
+        return ChzzkDownloader._session
     
+    @staticmethod
+    def _cookie_dict(cookies: Optional[Union[str, Dict[str, str]]]) -> Optional[Dict[str, str]]:
+        """Normalize cookies to a dict for per-request use (the shared session keeps no cookies)."""
+        if not cookies:
+            return None
+        if isinstance(cookies, str):
+            return ChzzkDownloader.parse_cookies(cookies)
+        return cookies
+
     @staticmethod
     def parse_cookies(cookie_string: str) -> Dict[str, str]:
         """Parse cookie string into dictionary format."""
         if not cookie_string:
             return {}
-        
+        # Fresh dict per call: callers may mutate it, the cached pairs stay immutable
+        return dict(ChzzkDownloader._parse_cookie_pairs(cookie_string))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _parse_cookie_pairs(cookie_string: str) -> Tuple[Tuple[str, str], ...]:
+        """Parse a cookie string once; repeated lookups of the same string hit the cache."""
         cookies = {}
         try:
             cookie_string = cookie_string.strip()
@@ -52,23 +145,14 @@ class ChzzkDownloader:
         except Exception:
             pass
         
-        return cookies
+        return tuple(cookies.items())
 
     @staticmethod
     def extract_video_info(link: str) -> Tuple[Optional[str], Optional[str]]:
         """Extract video number from CHZZK URL."""
-        patterns = [
-            r'https?://chzzk\.naver\.com/video/(?P<video_no>\d+)(?:\?.*)?$',
-            r'https?://chzzk\.naver\.com/(?:video/(?P<video_no>\d+)|live/(?P<channel_id>[^/?]+))(?:\?.*)?$',
-            r'https?://m\.chzzk\.naver\.com/video/(?P<video_no>\d+)(?:\?.*)?$'
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, link.strip())
-            if match:
-                video_no = match.group("video_no")
-                if video_no:
-                    return video_no, None
+        match = ChzzkDownloader._VIDEO_URL_RE.match(link.strip())
+        if match:
+            return match.group("video_no"), None
         
         return None, "올바르지 않은 링크입니다. 치지직 비디오 URL을 확인해주세요."
 
@@ -80,35 +164,29 @@ class ChzzkDownloader:
             "User-Agent": ChzzkDownloader.USER_AGENT,
             "Accept": "application/json, text/plain, */*",
             "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Accept-Encoding": "gzip, deflate, br",
+            # Only advertises br when brotli is installed, so urllib3 can always decode the body
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Referer": "https://chzzk.naver.com/",
             "Origin": "https://chzzk.naver.com"
         }
         
-        # Setup session with cookies if provided
-        session = requests.Session()
-        if cookies:
-            if isinstance(cookies, str):
-                cookies = ChzzkDownloader.parse_cookies(cookies)
-            session.cookies.update(cookies)
+        # Cookies are sent per request so the shared session stays free of user state
+        cookies = ChzzkDownloader._cookie_dict(cookies)
+        session = ChzzkDownloader.get_session()
         
-        # Retry mechanism for better reliability
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = session.get(api_url, headers=headers, timeout=30)
-                response.raise_for_status()
-                break
-            except requests.RequestException as e:
-                if attempt == max_retries - 1:
-                    return None, f"비디오 정보를 가져오는데 실패했습니다 (시도 {max_retries}회): {str(e)}"
-                time.sleep(1)
+        # Connection errors and 429/5xx are retried with backoff by the session's adapter
+        try:
+            response = session.get(api_url, headers=headers, cookies=cookies, timeout=30)
+        except requests.RequestException as e:
+            return None, f"비디오 정보를 가져오는데 실패했습니다: {str(e)}"
 
         # Handle HTTP status codes
         if response.status_code == 404:
             return None, "비디오를 찾을 수 없습니다."
         elif response.status_code == 403:
             return None, "비디오에 접근할 권한이 없습니다. 성인 인증이 필요한 경우 쿠키를 설정해주세요."
+        elif not response.ok:
+            return None, f"비디오 정보를 가져오는데 실패했습니다 (HTTP {response.status_code})"
 
         try:
             json_data = response.json()
@@ -191,144 +269,118 @@ class ChzzkDownloader:
             return None, f"예상치 못한 오류: {str(e)}"
 
     @staticmethod
-    def _parse_dash_manifest(video_url: str, cookies: Optional[Union[str, Dict[str, str]]] = None) -> Optional[List[Dict[str, Any]]]:
+    def _parse_dash_manifest(video_url: str, cookies: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
         """Parse DASH manifest to extract stream quality information."""
         headers = {
             "User-Agent": ChzzkDownloader.USER_AGENT,
             "Accept": "application/dash+xml, application/xml, text/xml, */*",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Referer": "https://chzzk.naver.com/"
         }
         
-        session = requests.Session()
-        if cookies:
-            if isinstance(cookies, str):
-                cookies = ChzzkDownloader.parse_cookies(cookies)
-            session.cookies.update(cookies)
+        session = ChzzkDownloader.get_session()
         
-        max_retries = 2
-        for attempt in range(max_retries):
-            try:
-                response = session.get(video_url, headers=headers, timeout=30)
-                response.raise_for_status()
-                
-                # Check content type - also try parsing if content starts with XML
-                content_type = response.headers.get('content-type', '').lower()
-                response_text = response.text.strip()
-                if 'xml' not in content_type and 'dash' not in content_type:
-                    if not response_text.startswith('<?xml') and not response_text.startswith('<MPD'):
-                        continue
-                
-                root = ET.fromstring(response.text)
-                ns = {"mpd": "urn:mpeg:dash:schema:mpd:2011"}
-                
-                stream_qualities = []
-                processed_qualities = set()  # Avoid duplicates
-
-                def _process_representation(representation, fallback_base_url=None, fallback_mime='video/mp4'):
-                    """Process a single Representation element."""
-                    width = representation.get('width')
-                    height = representation.get('height')
-                    bandwidth = representation.get('bandwidth')
-                    rep_id = representation.get('id', '')
-                    mime_type = representation.get('mimeType', fallback_mime)
-
-                    # Get representation-specific base URL
-                    rep_base_url_element = representation.find("mpd:BaseURL", namespaces=ns)
-                    base_url = rep_base_url_element.text if rep_base_url_element is not None else fallback_base_url
-
-                    if width and height and base_url:
-                        # Skip HLS-only representations
-                        if base_url.rstrip('/').endswith('/hls'):
-                            return
-                        quality_key = f"{width}x{height}_{mime_type}"
-                        if quality_key not in processed_qualities:
-                            processed_qualities.add(quality_key)
-                            stream_qualities.append({
-                                'resolution': f"{width}x{height}",
-                                'width': int(width),
-                                'height': int(height),
-                                'bandwidth': int(bandwidth) if bandwidth else 0,
-                                'base_url': base_url,
-                                'id': rep_id,
-                                'mime_type': mime_type,
-                                'quality_label': ChzzkDownloader._get_quality_label(int(height))
-                            })
-
-                # Method 1: Process AdaptationSets
-                for adaptation_set in root.findall(".//mpd:AdaptationSet", namespaces=ns):
-                    mime_type = adaptation_set.get('mimeType', '')
-
-                    # Process video streams
-                    if 'video' in mime_type:
-                        # Get base URL from AdaptationSet or root
-                        adaptation_base_url = None
-                        base_url_element = adaptation_set.find("mpd:BaseURL", namespaces=ns)
-                        if base_url_element is None:
-                            base_url_element = root.find(".//mpd:BaseURL", namespaces=ns)
-                        if base_url_element is not None:
-                            adaptation_base_url = base_url_element.text
-
-                        for representation in adaptation_set.findall("mpd:Representation", namespaces=ns):
-                            _process_representation(representation, adaptation_base_url, mime_type)
-
-                # Method 2: If no streams found via AdaptationSets, try direct Representation search
-                if not stream_qualities:
-                    root_base_url = None
-                    root_base_url_el = root.find(".//mpd:BaseURL", namespaces=ns)
-                    if root_base_url_el is not None:
-                        root_base_url = root_base_url_el.text
-                    for representation in root.findall(".//mpd:Representation", namespaces=ns):
-                        _process_representation(representation, root_base_url)
-                
-                if stream_qualities:
-                    # Test stream accessibility and filter out broken ones
-                    valid_streams = ChzzkDownloader._filter_valid_streams(stream_qualities)
-                    if valid_streams:
-                        # Sort by resolution and bandwidth
-                        valid_streams.sort(key=lambda x: (x['height'], x['bandwidth']), reverse=True)
-                        return valid_streams
-                    else:
-                        # If no streams are valid, return original list and let download methods handle it
-                        stream_qualities.sort(key=lambda x: (x['height'], x['bandwidth']), reverse=True)
-                        return stream_qualities
-                
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    pass  # Will try fallback method
-                else:
-                    time.sleep(0.5)
+        try:
+            response = session.get(video_url, headers=headers, cookies=cookies, timeout=30)
+            response.raise_for_status()
+            
+            # Check content type - also try parsing if content starts with XML
+            content_type = response.headers.get('content-type', '').lower()
+            if 'xml' not in content_type and 'dash' not in content_type:
+                # Sniff the raw bytes; decoding to str here would be thrown away by the parser
+                if not response.content.lstrip().startswith((b'<?xml', b'<MPD')):
+                    return None
+            
+            root = ET.fromstring(response.content)
+            representation_tag = ChzzkDownloader._MPD_REPRESENTATION
+            base_url_tag = ChzzkDownloader._MPD_BASE_URL
+            # First BaseURL in the document: fallback for sets and representations without their own
+            root_base_url = root.findtext(".//" + base_url_tag)
+            
+            stream_qualities = []
+            processed_qualities = set()  # Avoid duplicates
+
+            def _process_representation(representation, fallback_base_url=None, fallback_mime='video/mp4'):
+                """Process a single Representation element."""
+                width = representation.get('width')
+                height = representation.get('height')
+                bandwidth = representation.get('bandwidth')
+                rep_id = representation.get('id', '')
+                mime_type = representation.get('mimeType', fallback_mime)
+
+                # Get representation-specific base URL
+                base_url = representation.findtext(base_url_tag, fallback_base_url)
+
+                if width and height and base_url:
+                    # Skip HLS-only representations
+                    if base_url.rstrip('/').endswith('/hls'):
+                        return
+                    quality_key = f"{width}x{height}_{mime_type}"
+                    if quality_key not in processed_qualities:
+                        processed_qualities.add(quality_key)
+                        stream_qualities.append({
+                            'resolution': f"{width}x{height}",
+                            'width': int(width),
+                            'height': int(height),
+                            'bandwidth': int(bandwidth) if bandwidth else 0,
+                            'base_url': base_url,
+                            'id': rep_id,
+                            'mime_type': mime_type,
+                            'quality_label': ChzzkDownloader._get_quality_label(int(height))
+                        })
+
+            # Method 1: Process AdaptationSets
+            for adaptation_set in root.iter(ChzzkDownloader._MPD_ADAPTATION_SET):
+                mime_type = adaptation_set.get('mimeType', '')
+
+                # Process video streams
+                if 'video' in mime_type:
+                    # Get base URL from AdaptationSet or root
+                    adaptation_base_url = adaptation_set.findtext(base_url_tag, root_base_url)
+
+                    for representation in adaptation_set.iterfind(representation_tag):
+                        _process_representation(representation, adaptation_base_url, mime_type)
+
+            # Method 2: If no streams found via AdaptationSets, try direct Representation search
+            if not stream_qualities:
+                for representation in root.iter(representation_tag):
+                    _process_representation(representation, root_base_url)
+            
+            if stream_qualities:
+                # Sort by resolution and bandwidth; accessibility is checked lazily in get_stream_by_quality
+                stream_qualities.sort(key=lambda x: (x['height'], x['bandwidth']), reverse=True)
+                return stream_qualities
+            
+        except Exception:
+            pass  # Will try fallback method
         
         return None
 
-    @staticmethod
-    def _filter_valid_streams(stream_qualities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Filter out streams that are not accessible"""
-        valid_streams = []
-        
-        for stream in stream_qualities:
-            if ChzzkDownloader._test_stream_access(stream['base_url']):
-                valid_streams.append(stream)
-        
-        return valid_streams
-    
     @staticmethod
     def _test_stream_access(stream_url: str) -> bool:
         """Test if a stream URL is accessible"""
         headers = {
             'User-Agent': ChzzkDownloader.USER_AGENT,
             'Referer': 'https://chzzk.naver.com/',
-            'Range': 'bytes=0-1023'  # Test with small range
         }
+        session = ChzzkDownloader.get_session()
 
         try:
-            response = requests.get(stream_url, headers=headers, timeout=5)
+            # HEAD transfers no body; redirects are followed to the final CDN response
+            response = session.head(stream_url, headers=headers, timeout=3, allow_redirects=True)
+            if response.status_code in (200, 206):
+                return True
+
+            # Some CDNs reject HEAD (e.g. 405/403); confirm with a small ranged GET
+            headers['Range'] = 'bytes=0-1023'
+            response = session.get(stream_url, headers=headers, timeout=5)
             # Accept both 200 (full content) and 206 (partial content) as valid
-            return response.status_code in [200, 206]
+            return response.status_code in (200, 206)
         except Exception:
             return False
 
     @staticmethod
-    def _get_fallback_streams(video_url: str, cookies: Optional[Union[str, Dict[str, str]]] = None) -> Optional[List[Dict[str, Any]]]:
+    def _get_fallback_streams(video_url: str, cookies: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
         """Fallback stream extraction method."""
         single_url = ChzzkDownloader._get_single_stream_url(video_url, cookies)
         if single_url:
@@ -345,29 +397,23 @@ class ChzzkDownloader:
         return None
     
     @staticmethod
-    def _get_single_stream_url(video_url: str, cookies: Optional[Union[str, Dict[str, str]]] = None) -> Optional[str]:
+    def _get_single_stream_url(video_url: str, cookies: Optional[Dict[str, str]] = None) -> Optional[str]:
         """Extract single stream URL from manifest."""
         headers = {
             "User-Agent": ChzzkDownloader.USER_AGENT,
-            "Accept": "application/dash+xml, application/xml, text/xml, */*"
+            "Accept": "application/dash+xml, application/xml, text/xml, */*",
+            "Accept-Encoding": ACCEPT_ENCODING
         }
         
-        session = requests.Session()
-        if cookies:
-            if isinstance(cookies, str):
-                cookies = ChzzkDownloader.parse_cookies(cookies)
-            session.cookies.update(cookies)
-        
         try:
-            response = session.get(video_url, headers=headers, timeout=15)
+            response = ChzzkDownloader.get_session().get(video_url, headers=headers, cookies=cookies, timeout=15)
             response.raise_for_status()
             
-            root = ET.fromstring(response.text)
-            ns = {"mpd": "urn:mpeg:dash:schema:mpd:2011"}
+            root = ET.fromstring(response.content)
             
-            base_url_element = root.find(".//mpd:BaseURL", namespaces=ns)
-            if base_url_element is not None:
-                return base_url_element.text
+            base_url = root.findtext(".//" + ChzzkDownloader._MPD_BASE_URL)
+            if base_url is not None:
+                return base_url
                 
         except Exception:
             pass
@@ -394,7 +440,22 @@ class ChzzkDownloader:
 
     @staticmethod
     def get_stream_by_quality(stream_qualities: List[Dict[str, Any]], preferred_quality: str = "best") -> Optional[Dict[str, Any]]:
-        """Select stream by preferred quality."""
+        """Select stream by preferred quality, moving on to the next stream if it is not accessible."""
+        selected = ChzzkDownloader._select_stream(stream_qualities, preferred_quality)
+        if selected is None:
+            return None
+
+        # Only the chosen stream is probed up front; the others are tried only if it fails
+        for stream in [selected] + [s for s in stream_qualities if s is not selected]:
+            if ChzzkDownloader._test_stream_access(stream['base_url']):
+                return stream
+
+        # No stream answered the probe; let the download methods report the actual error
+        return selected
+
+    @staticmethod
+    def _select_stream(stream_qualities: List[Dict[str, Any]], preferred_quality: str) -> Optional[Dict[str, Any]]:
+        """Pick the stream matching the preferred quality (no network access)."""
         if not stream_qualities:
             return None
         
@@ -419,7 +480,7 @@ class ChzzkDownloader:
     @staticmethod
     def _parse_quality_to_height(quality_str: str) -> Optional[int]:
         """Parse quality string to height value."""
-        match = re.search(r'(\d+)p?', quality_str)
+        match = ChzzkDownloader._QUALITY_RE.search(quality_str)
         return int(match.group(1)) if match else None
 
     @staticmethod
@@ -459,37 +520,50 @@ class ChzzkDownloader:
         except Exception as e:
             return False, f"다운로드 중 오류 발생: {str(e)}"
 
+    @staticmethod
+    def download_audio_segment(base_url: str, audio_path: str, start_time: int, end_time: int,
+                             progress_callback: Optional[Callable[[float], None]] = None) -> Tuple[bool, str]:
+        """Download only the audio of a segment, decoded straight to 16 kHz mono WAV.
+
+        Skips the intermediate video file: FFmpeg reads the stream and writes the
+        PCM that AudioProcessor expects, so the video is never written or re-read.
+        """
+        if not FFMPEG_AVAILABLE:
+            return False, "FFmpeg 라이브러리가 설치되지 않았습니다."
+
+        total_duration = end_time - start_time
+        if total_duration <= 0:
+            return False, "잘못된 구간입니다."
+
+        try:
+            process = ChzzkDownloader._start_ffmpeg([
+                '-ss', str(start_time), '-t', str(total_duration),
+                *ChzzkDownloader._FFMPEG_HTTP_INPUT, '-reconnect_delay_max', '5',
+                '-i', base_url,
+                '-vn', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', '16000',
+                audio_path
+            ])
+            return ChzzkDownloader._monitor_ffmpeg_process(process, total_duration, progress_callback, audio_path)
+        except Exception as e:
+            return False, f"오디오 다운로드 중 오류 발생: {str(e)}"
+
+    @staticmethod
+    def _start_ffmpeg(args: List[str], loglevel: str = 'warning', stdin: int = subprocess.DEVNULL) -> subprocess.Popen:
+        """Start FFmpeg with progress reporting on stderr (see _monitor_ffmpeg_process)."""
+        argv = ['ffmpeg', '-y', '-nostats', '-progress', 'pipe:2', '-loglevel', loglevel, *args]
+        return subprocess.Popen(argv, stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
     @staticmethod
     def _download_method_1(base_url: str, output_path: str, start_time: int, total_duration: int, 
                           progress_callback: Optional[Callable[[float], None]] = None) -> Tuple[bool, str]:
         """Method 1: Standard FFmpeg with enhanced headers"""
-        input_options = {
-            'ss': start_time,
-            't': total_duration,
-            'user_agent': ChzzkDownloader.USER_AGENT,
-            'headers': f'Referer: https://chzzk.naver.com/\r\nUser-Agent: {ChzzkDownloader.USER_AGENT}',
-            'reconnect': 1,
-            'reconnect_streamed': 1,
-            'reconnect_delay_max': 5
-        }
-
-        output_options = {
-            'c': 'copy',
-            'avoid_negative_ts': 'make_zero',
-            'fflags': '+genpts',
-            'movflags': '+faststart'
-        }
-
-        process = (
-            ffmpeg
-            .input(base_url, **input_options)
-            .output(output_path, **output_options)
-            .overwrite_output()
-            .global_args('-progress', 'pipe:2')
-            .global_args('-nostats')
-            .global_args('-loglevel', 'warning')
-            .run_async(pipe_stdout=True, pipe_stderr=True)
-        )
+        process = ChzzkDownloader._start_ffmpeg([
+            '-ss', str(start_time), '-t', str(total_duration),
+            *ChzzkDownloader._FFMPEG_HTTP_INPUT, '-reconnect_delay_max', '5',
+            '-i', base_url,
+            *ChzzkDownloader._FFMPEG_COPY_OUTPUT, '-fflags', '+genpts', '-movflags', '+faststart',
+            output_path
+        ])
 
         return ChzzkDownloader._monitor_ffmpeg_process(process, total_duration, progress_callback, output_path)
 
@@ -497,30 +571,13 @@ class ChzzkDownloader:
     def _download_method_2(base_url: str, output_path: str, start_time: int, total_duration: int, 
                           progress_callback: Optional[Callable[[float], None]] = None) -> Tuple[bool, str]:
         """Method 2: Simplified options"""
-        input_options = {
-            'user_agent': ChzzkDownloader.USER_AGENT,
-            'headers': f'Referer: https://chzzk.naver.com/\r\nUser-Agent: {ChzzkDownloader.USER_AGENT}',
-            'reconnect': 1,
-            'reconnect_streamed': 1
-        }
-
-        output_options = {
-            'ss': start_time,
-            't': total_duration,
-            'c': 'copy',
-            'avoid_negative_ts': 'make_zero'
-        }
-
-        process = (
-            ffmpeg
-            .input(base_url, **input_options)
-            .output(output_path, **output_options)
-            .overwrite_output()
-            .global_args('-progress', 'pipe:2')
-            .global_args('-nostats')
-            .global_args('-loglevel', 'warning')
-            .run_async(pipe_stdout=True, pipe_stderr=True)
-        )
+        process = ChzzkDownloader._start_ffmpeg([
+            *ChzzkDownloader._FFMPEG_HTTP_INPUT,
+            '-i', base_url,
+            '-ss', str(start_time), '-t', str(total_duration),
+            *ChzzkDownloader._FFMPEG_COPY_OUTPUT,
+            output_path
+        ])
 
         return ChzzkDownloader._monitor_ffmpeg_process(process, total_duration, progress_callback, output_path)
 
@@ -528,23 +585,13 @@ class ChzzkDownloader:
     def _download_method_3(base_url: str, output_path: str, start_time: int, total_duration: int, 
                           progress_callback: Optional[Callable[[float], None]] = None) -> Tuple[bool, str]:
         """Method 3: Basic options with re-encoding if needed"""
-        process = (
-            ffmpeg
-            .input(base_url,
-                   ss=start_time,
-                   t=total_duration,
-                   headers=f'User-Agent: {ChzzkDownloader.USER_AGENT}')
-            .output(output_path,
-                   vcodec='libx264',
-                   acodec='aac',
-                   preset='fast',
-                   crf=23)
-            .overwrite_output()
-            .global_args('-progress', 'pipe:2')
-            .global_args('-nostats')
-            .global_args('-loglevel', 'error')
-            .run_async(pipe_stdout=True, pipe_stderr=True)
-        )
+        process = ChzzkDownloader._start_ffmpeg([
+            '-ss', str(start_time), '-t', str(total_duration),
+            '-headers', ChzzkDownloader._FFMPEG_UA_HEADER,
+            '-i', base_url,
+            *ChzzkDownloader._FFMPEG_REENCODE_OUTPUT,
+            output_path
+        ], loglevel='error')
 
         return ChzzkDownloader._monitor_ffmpeg_process(process, total_duration, progress_callback, output_path)
 
@@ -554,48 +601,45 @@ class ChzzkDownloader:
                                output_path: str = None) -> Tuple[bool, str]:
         """Monitor FFmpeg process and handle progress/errors"""
         last_progress = 0
-        stderr_lines = []
-        
-        while True:
-            if process.poll() is not None:
-                break
+        stderr_lines = deque(maxlen=20)  # Last lines for error reporting
 
-            line = process.stderr.readline()
+        def handle_line(line: bytes):
+            nonlocal last_progress
+            line = line.strip()
             if not line:
-                time.sleep(0.1)
-                continue
+                return
+            stderr_lines.append(line)
 
-            decoded_line = line.decode('utf-8', errors='replace').strip()
-            stderr_lines.append(decoded_line)
-            
-            # Keep only last 20 lines for error reporting
-            if len(stderr_lines) > 20:
-                stderr_lines = stderr_lines[-20:]
-            
             # Enhanced progress tracking
-            if progress_callback:
-                if 'out_time_ms=' in decoded_line:
-                    match = re.search(r'out_time_ms=(\d+)', decoded_line)
-                    if match:
-                        current_time_ms = int(match.group(1))
-                        current_time = current_time_ms / 1_000_000
-                        if current_time > total_duration:
-                            current_time = total_duration
-                        progress = (current_time / total_duration) * 100
-                        if progress > last_progress:
-                            progress_callback(progress)
-                            last_progress = progress
-                elif 'out_time=' in decoded_line:
-                    match = re.search(r'out_time=(\d+):(\d+):(\d+)\.(\d+)', decoded_line)
-                    if match:
-                        h, m, s, ms = map(int, match.groups())
-                        current_time = h * 3600 + m * 60 + s + ms / 1000
-                        if current_time > total_duration:
-                            current_time = total_duration
-                        progress = (current_time / total_duration) * 100
-                        if progress > last_progress:
-                            progress_callback(progress)
-                            last_progress = progress
+            if not progress_callback:
+                return
+            match = ChzzkDownloader._OUT_TIME_MS_RE.match(line)
+            if match:
+                current_time = int(match.group(1)) / 1_000_000
+            else:
+                match = ChzzkDownloader._OUT_TIME_RE.match(line)
+                if not match:
+                    return
+                h, m, sec, frac = match.groups()
+                current_time = int(h) * 3600 + int(m) * 60 + int(sec) + float(frac)
+            progress = (min(current_time, total_duration) / total_duration) * 100
+            if progress > last_progress:
+                progress_callback(progress)
+                last_progress = progress
+
+        # Blocking chunked reads return as soon as FFmpeg writes and hit EOF when it exits,
+        # so there is no poll/sleep gap and no output is lost after the process ends
+        fd = process.stderr.fileno()
+        pending = b''
+        while True:
+            chunk = os.read(fd, ChzzkDownloader._STDERR_CHUNK)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                handle_line(line)
+        handle_line(pending)
 
         return_code = process.wait()
         
@@ -607,92 +651,224 @@ class ChzzkDownloader:
                 return False, "다운로드 완료했지만 파일이 비어있습니다."
         else:
             # Extract meaningful error from stderr
-            error_lines = [line for line in stderr_lines if any(keyword in line.lower() 
-                          for keyword in ['error', 'failed', 'invalid', 'not found', 'forbidden', 'http'])]
+            error_lines = [line for line in stderr_lines if ChzzkDownloader._ERROR_LINE_RE.search(line)]
+            report_lines = (error_lines or list(stderr_lines))[-3:]  # Last 3 error lines
             
-            if error_lines:
-                error_info = '; '.join(error_lines[-3:])  # Last 3 error lines
+            if report_lines:
+                error_info = '; '.join(line.decode('utf-8', errors='replace') for line in report_lines)
             else:
-                error_info = '; '.join(stderr_lines[-3:]) if stderr_lines else "알 수 없는 오류"
+                error_info = "알 수 없는 오류"
             
             return False, f"다운로드 실패 (코드: {return_code}): {error_info}"
 
     @staticmethod
     def _download_method_4(base_url: str, output_path: str, start_time: int, total_duration: int,
                           progress_callback: Optional[Callable[[float], None]] = None) -> Tuple[bool, str]:
-        """Method 4: Direct HTTP download with Python requests, then extract segment with FFmpeg"""
+        """Method 4: Direct HTTP download with Python requests, cut to the segment with FFmpeg.
+
+        A pipe is not seekable, so FFmpeg can only cut from stdin when the MP4 index
+        (moov) precedes the media data. The first piece of the body tells which
+        layout the file has: moov first is piped into FFmpeg, which exits once the
+        segment is written and so stops the download early; moov at the end is
+        downloaded to a temp file and cut there. If the piped cut still fails, the
+        temp-file path is tried with a fresh download.
+        """
+        headers = {
+            'User-Agent': ChzzkDownloader.USER_AGENT,
+            'Referer': 'https://chzzk.naver.com/',
+        }
         try:
-            headers = {
-                'User-Agent': ChzzkDownloader.USER_AGENT,
-                'Referer': 'https://chzzk.naver.com/',
-            }
+            response = ChzzkDownloader._open_stream_body(base_url, headers)
+        except requests.HTTPError as e:
+            return False, str(e)  # The server refused the stream
+        except Exception as e:
+            return False, f"HTTP 다운로드 오류: {str(e)}"
 
-            response = requests.get(base_url, headers=headers, stream=True, timeout=60)
+        body = ChzzkDownloader._iter_stream_body(response, base_url, headers)
+        try:
+            head = next(body, b'')
+            chunks = itertools.chain((head,), body)
+            if ChzzkDownloader._mp4_moov_first(head):
+                success, message = ChzzkDownloader._pipe_http_to_ffmpeg(chunks, output_path, start_time,
+                                                                        total_duration, progress_callback)
+                if success:
+                    return True, message
+            else:
+                return ChzzkDownloader._download_http_then_cut(response, chunks, output_path, start_time,
+                                                               total_duration, progress_callback)
+        except Exception as e:
+            return False, f"HTTP 다운로드 오류: {str(e)}"
+        finally:
+            body.close()
+            response.close()
 
-            if response.status_code != 200:
-                return False, f"HTTP 오류: {response.status_code}"
+        # The piped cut failed: retry from a seekable copy of the whole body
+        try:
+            response = ChzzkDownloader._open_stream_body(base_url, headers)
+            body = ChzzkDownloader._iter_stream_body(response, base_url, headers)
+            try:
+                return ChzzkDownloader._download_http_then_cut(response, body, output_path, start_time,
+                                                               total_duration, progress_callback)
+            finally:
+                body.close()
+                response.close()
+        except Exception as e:
+            return False, f"HTTP 다운로드 오류: {str(e)} (파이프 시도: {message})"
 
-            # Download full file to output_path, then extract segment in-place
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
+    @staticmethod
+    def _mp4_moov_first(head: bytes) -> bool:
+        """Whether the top-level MP4 boxes in head put moov before mdat.
+
+        Walks box headers only; anything that does not parse as MP4 before either
+        box is reached (other containers, a truncated header) counts as moov first,
+        so the stream is piped as before.
+        """
+        offset = 0
+        while offset + 8 <= len(head):
+            size = int.from_bytes(head[offset:offset + 4], 'big')
+            box_type = head[offset + 4:offset + 8]
+            if box_type == b'moov':
+                return True
+            if box_type == b'mdat':
+                return False
+            if size == 1:  # 64-bit largesize follows the type
+                if offset + 16 > len(head):
+                    break
+                size = int.from_bytes(head[offset + 8:offset + 16], 'big')
+            if size < 8:  # 0 (box runs to end of file) or malformed
+                break
+            offset += size
+        return True
 
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=65536):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
+    @staticmethod
+    def _open_stream_body(base_url: str, headers: Dict[str, str]) -> requests.Response:
+        """Request the first RANGE_CHUNK_SIZE bytes; the response doubles as a range-support check for _iter_stream_body."""
+        first_range = {**headers, 'Range': f'bytes=0-{ChzzkDownloader.RANGE_CHUNK_SIZE - 1}'}
+        response = ChzzkDownloader.get_session().get(base_url, headers=first_range, stream=True, timeout=60)
+        if response.status_code not in (200, 206):
+            response.close()
+            raise requests.HTTPError(f"HTTP 오류: {response.status_code}", response=response)
+        return response
 
-                        if progress_callback and total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            progress_callback(min(progress, 100))
+    @staticmethod
+    def _pipe_http_to_ffmpeg(chunks: Iterator[bytes], output_path: str, start_time: int, total_duration: int,
+                             progress_callback: Optional[Callable[[float], None]] = None) -> Tuple[bool, str]:
+        """Stream the HTTP body into FFmpeg stdin and cut the segment on the fly."""
+        process = ChzzkDownloader._start_ffmpeg([
+            '-i', 'pipe:0',
+            '-ss', str(start_time), '-t', str(total_duration),
+            '-c', 'copy',
+            output_path
+        ], stdin=subprocess.PIPE)
+        feed_errors = []
+
+        def feed():
+            try:
+                for chunk in chunks:
+                    process.stdin.write(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # FFmpeg has the whole segment (or gave up) and closed its input
+            except Exception as e:
+                feed_errors.append(e)
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
 
-            # Verify download
-            if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-                return False, "다운로드된 파일이 비어있습니다"
+        # stdin is fed from a thread while this one drains stderr, so neither pipe can fill up
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        success, message = ChzzkDownloader._monitor_ffmpeg_process(process, total_duration, progress_callback,
+                                                                   output_path)
+        feeder.join()
 
-            # Extract the requested segment using FFmpeg (renames to .temp, extracts back)
-            return ChzzkDownloader._extract_segment_post_download(output_path, start_time, total_duration)
+        if feed_errors:
+            return False, f"HTTP 다운로드 오류: {feed_errors[0]}"
+        return success, message
 
-        except Exception as e:
-            return False, f"HTTP 다운로드 오류: {str(e)}"
-    
     @staticmethod
-    def _extract_segment_post_download(file_path: str, start_time: int, total_duration: int) -> Tuple[bool, str]:
-        """Extract segment from downloaded file using FFmpeg"""
-        temp_path = file_path + ".temp"
-        
+    def _download_http_then_cut(response: requests.Response, chunks: Iterator[bytes], output_path: str,
+                                start_time: int, total_duration: int,
+                                progress_callback: Optional[Callable[[float], None]] = None) -> Tuple[bool, str]:
+        """Write the whole HTTP body to a temp file, then cut the segment from the seekable copy."""
+        temp_path = output_path + ".temp"
+        match = ChzzkDownloader._CONTENT_RANGE_RE.match(response.headers.get('content-range', ''))
+        total_size = int(match.group(1)) if match else int(response.headers.get('content-length', 0))
+
         try:
-            # Move original to temp
-            os.rename(file_path, temp_path)
-            
-            # Extract segment
-            process = (
-                ffmpeg
-                .input(temp_path, ss=start_time, t=total_duration)
-                .output(file_path, c='copy')
-                .overwrite_output()
-                .global_args('-loglevel', 'error')
-                .run_async(pipe_stdout=True, pipe_stderr=True)
+            downloaded = 0
+            with open(temp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    # The download is the first half of the work, the cut the second
+                    if progress_callback and total_size > 0:
+                        progress_callback(min(downloaded / total_size, 1) * 50)
+
+            if downloaded == 0:
+                return False, "다운로드된 파일이 비어있습니다"
+
+            def cut_progress(progress: float):
+                progress_callback(50 + progress / 2)
+
+            process = ChzzkDownloader._start_ffmpeg([
+                '-ss', str(start_time), '-t', str(total_duration),
+                '-i', temp_path,
+                '-c', 'copy',
+                output_path
+            ])
+            success, message = ChzzkDownloader._monitor_ffmpeg_process(
+                process, total_duration, cut_progress if progress_callback else None, output_path
             )
-            
-            return_code = process.wait()
-            
-            # Cleanup temp file
-            try:
-                os.remove(temp_path)
-            except OSError:
-                pass
-            
-            if return_code == 0 and os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            if success:
                 return True, "다운로드 완료 (HTTP + 세그먼트 추출)"
-            else:
-                return False, f"세그먼트 추출 실패 (코드: {return_code})"
-                
-        except Exception as e:
-            # Restore original file if possible
+            return False, f"세그먼트 추출 실패: {message}"
+        finally:
             try:
-                if os.path.exists(temp_path):
-                    os.rename(temp_path, file_path)
+                os.remove(temp_path)
             except OSError:
                 pass
-            return False, f"세그먼트 추출 오류: {str(e)}"
\ No newline at end of file
+
+    @staticmethod
+    def _iter_stream_body(first_response: requests.Response, url: str,
+                          headers: Dict[str, str]) -> Iterator[bytes]:
+        """Yield a stream's body in order, starting from the response to its first range.
+
+        If the server answered that range with 206, the rest is fetched as
+        RANGE_CHUNK_SIZE pieces, RANGE_WORKERS at a time on separate pooled
+        connections, which helps on CDNs that throttle per connection. Otherwise
+        (the server ignored Range) the body is streamed as-is. Closing the
+        generator stops fetching.
+        """
+        match = ChzzkDownloader._CONTENT_RANGE_RE.match(first_response.headers.get('content-range', ''))
+        if first_response.status_code != 206 or not match:
+            yield from first_response.iter_content(chunk_size=ChzzkDownloader.HTTP_CHUNK_SIZE)
+            return
+
+        total_size = int(match.group(1))
+        session = ChzzkDownloader.get_session()
+
+        def fetch(start: int) -> bytes:
+            end = min(start + ChzzkDownloader.RANGE_CHUNK_SIZE, total_size) - 1
+            response = session.get(url, headers={**headers, 'Range': f'bytes={start}-{end}'}, timeout=60)
+            if response.status_code != 206:
+                raise requests.HTTPError(f"범위 요청 실패: {response.status_code}", response=response)
+            return response.content
+
+        yield first_response.content
+
+        offsets = iter(range(ChzzkDownloader.RANGE_CHUNK_SIZE, total_size, ChzzkDownloader.RANGE_CHUNK_SIZE))
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=ChzzkDownloader.RANGE_WORKERS)
+        pending = deque(executor.submit(fetch, offset)
+                        for offset in itertools.islice(offsets, ChzzkDownloader.RANGE_WORKERS))
+        try:
+            while pending:
+                data = pending.popleft().result()
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.append(executor.submit(fetch, next_offset))
+                yield data
+        finally:
+            # Early stop (FFmpeg done) or error: drop queued pieces without waiting for them
+            executor.shutdown(wait=False, cancel_futures=True)
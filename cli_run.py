@@ -104,6 +104,9 @@ def run(
         safe_file_removal(video_path)
         return
 
+    # Decode once; diarization and Whisper both reuse the samples
+    audio = processor.load_audio(audio_path)
+
     # 7) Load models
     print(f"[4/7] Loading Whisper model ({whisper_model}) on {processor.device}...")
     processor.load_models()
@@ -112,12 +115,12 @@ def run(
     diarization = None
     if enable_diarization:
         print("[5/7] Performing speaker diarization...")
-        diarization = processor.perform_diarization(audio_path)
+        diarization = processor.perform_diarization(audio_path, audio=audio)
 
     # 9) Transcribe
     print("[5/7] Transcribing audio..." if not enable_diarization else "[6/7] Transcribing audio...")
     t0 = time.time()
-    whisper_result, error = processor.transcribe_with_whisper(audio_path)
+    whisper_result, error = processor.transcribe_with_whisper(audio_path, audio)
     dt = time.time() - t0
     if error:
         print(f"[ERROR] {error}")
@@ -128,13 +131,7 @@ def run(
     # 10) Generate transcript
     step = "6/7" if not enable_diarization else "7/7"
     print(f"[{step}] Generating transcript...")
-    if output_format == "srt":
-        transcript = processor.create_srt_transcript(whisper_result, diarization)
-    else:
-        transcript = processor.create_transcript(whisper_result, diarization)
-
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        f.write(transcript)
+    processor.write_transcript(transcript_path, whisper_result, diarization, output_format)
 
     # 11) Cleanup
     print("[7/7] Cleaning up...")
@@ -143,10 +140,13 @@ def run(
     print(f"\n=== DONE ===")
     print(f"Transcript saved to: {transcript_path}")
     print(f"\n--- Transcript Preview ---")
-    for line in transcript.split("\n")[:20]:
-        print(line)
-    if len(transcript.split("\n")) > 20:
-        print(f"... ({len(transcript.split(chr(10)))} lines total)")
+    total_lines = 0
+    with open(transcript_path, encoding="utf-8") as f:
+        for total_lines, line in enumerate(f, 1):
+            if total_lines <= 20:
+                print(line.rstrip("\n"))
+    if total_lines > 20:
+        print(f"... ({total_lines} lines total)")
 
 
 if __name__ == "__main__":
@@ -3,19 +3,32 @@ Configuration management for the video transcriber application.
 """
 import json
 import os
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    STREAMLIT_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_config(config: Dict[str, Any]) -> bytes:
+    """Serialize config as indented UTF-8 JSON (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(config, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type
+_loads_config = orjson.loads if ORJSON_AVAILABLE else json.loads
 
 
 class ConfigManager:
     """Manages application configuration with file persistence."""
     
-    DEFAULT_CONFIG = {
+    # Read-only and shared by all instances; load_config hands out copies
+    DEFAULT_CONFIG = MappingProxyType({
         "download_path": "./downloads",
         "whisper_model": "large-v3-turbo",
         "huggingface_token": "",
@@ -24,7 +37,17 @@ class ConfigManager:
         "default_quality": "best",
         "use_gpu": True,
         "diarization_backend": "auto"
-    }
+    })
+    
+    # Option lists in UI order; the frozensets back validate_config's membership checks
+    # (values come from hand-editable JSON, so validate_config checks for str before hashing)
+    WHISPER_MODELS = ("large-v3", "large-v3-turbo", "turbo", "large-v2", "medium", "small", "base", "tiny")
+    OUTPUT_FORMATS = ("txt", "srt")
+    QUALITY_OPTIONS = ("best", "1080p", "720p", "480p", "360p", "worst")
+    _OUTPUT_FORMAT_SET = frozenset(OUTPUT_FORMATS)
+    _QUALITY_OPTION_SET = frozenset(QUALITY_OPTIONS)
+    
+    __slots__ = ("config_file", "config", "_dir_ready", "_saved_config")
     
     def __init__(self, config_file: str = "./config/config.json"):
         """
@@ -34,6 +57,8 @@ class ConfigManager:
             config_file: Path to configuration file
         """
         self.config_file = config_file
+        self._dir_ready = False  # Config directory created (or found) by an earlier save
+        self._saved_config: Optional[Dict[str, Any]] = None  # Content last read from/written to disk
         self.config = self.load_config()
     
     def load_config(self) -> Dict[str, Any]:
@@ -45,13 +70,15 @@ class ConfigManager:
         """
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    loaded_config = _loads_config(f.read())
                     # Merge with defaults to ensure all keys exist
-                    return {**self.DEFAULT_CONFIG, **loaded_config}
+                    merged = {**self.DEFAULT_CONFIG, **loaded_config}
+                    self._saved_config = dict(merged)
+                    return merged
             except (json.JSONDecodeError, IOError):
-                return self.DEFAULT_CONFIG.copy()
-        return self.DEFAULT_CONFIG.copy()
+                return dict(self.DEFAULT_CONFIG)
+        return dict(self.DEFAULT_CONFIG)
     
     def save_config(self, config: Dict[str, Any]) -> bool:
         """
@@ -63,21 +90,43 @@ class ConfigManager:
         Returns:
             True if successful, False otherwise
         """
+        # Same content as the file already holds: nothing to write
+        if config == self._saved_config:
+            self.config = config
+            return True
+        
+        tmp_path = self.config_file + ".tmp"
         try:
-            # Ensure config directory exists
-            config_dir = os.path.dirname(self.config_file)
-            if config_dir:
-                os.makedirs(config_dir, exist_ok=True)
+            # Ensure config directory exists (once per instance)
+            if not self._dir_ready:
+                config_dir = os.path.dirname(self.config_file)
+                if config_dir:
+                    os.makedirs(config_dir, exist_ok=True)
+                self._dir_ready = True
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            # Write a temp file and swap it in, so a crash never leaves a half-written config
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps_config(config))
+            os.replace(tmp_path, self.config_file)
             
+            self._saved_config = dict(config)
             self.config = config
             return True
             
         except Exception as e:
-            if STREAMLIT_AVAILABLE:
+            # The directory may have been removed; check it again on the next save
+            self._dir_ready = False
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+            # Streamlit is only needed on this error path, so it is imported here
+            try:
+                import streamlit as st
                 st.error(f"설정 저장 실패: {str(e)}")
+            except ImportError:
+                pass
             
             # Update in-memory config even if file save fails
             self.config = config
@@ -96,6 +145,15 @@ class ConfigManager:
         """
         return self.config.get(key, default)
     
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a shallow copy of the whole configuration.
+        
+        Returns:
+            Configuration dictionary that callers can read without further lookups
+        """
+        return dict(self.config)
+    
     def set(self, key: str, value: Any) -> None:
         """
         Set configuration value in memory.
@@ -117,15 +175,15 @@ class ConfigManager:
     
     def get_whisper_models(self) -> list:
         """Get list of available Whisper models."""
-        return ["large-v3", "large-v3-turbo", "turbo", "large-v2", "medium", "small", "base", "tiny"]
+        return list(self.WHISPER_MODELS)
     
     def get_output_formats(self) -> list:
         """Get list of available output formats."""
-        return ["txt", "srt"]
+        return list(self.OUTPUT_FORMATS)
     
     def get_quality_options(self) -> list:
         """Get list of available quality options."""
-        return ["best", "1080p", "720p", "480p", "360p", "worst"]
+        return list(self.QUALITY_OPTIONS)
     
     def validate_config(self) -> Dict[str, str]:
         """
@@ -135,25 +193,26 @@ class ConfigManager:
             Dictionary of validation errors (empty if valid)
         """
         errors = {}
+        cfg = self.config
         
         # Validate download path
-        download_path = self.get("download_path")
+        download_path = cfg.get("download_path")
         if not download_path:
             errors["download_path"] = "다운로드 경로가 설정되지 않았습니다."
         
         # Validate whisper model (allow custom model names for HuggingFace models)
-        whisper_model = self.get("whisper_model")
+        whisper_model = cfg.get("whisper_model")
         if not whisper_model:
             errors["whisper_model"] = "Whisper 모델이 설정되지 않았습니다."
         
         # Validate output format
-        output_format = self.get("output_format")
-        if output_format not in self.get_output_formats():
+        output_format = cfg.get("output_format")
+        if not isinstance(output_format, str) or output_format not in self._OUTPUT_FORMAT_SET:
             errors["output_format"] = f"지원하지 않는 출력 형식: {output_format}"
         
         # Validate quality
-        default_quality = self.get("default_quality")
-        if default_quality not in self.get_quality_options():
+        default_quality = cfg.get("default_quality")
+        if not isinstance(default_quality, str) or default_quality not in self._QUALITY_OPTION_SET:
             errors["default_quality"] = f"지원하지 않는 화질 설정: {default_quality}"
         
         return errors
\ No newline at end of file
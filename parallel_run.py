@@ -216,25 +216,26 @@ def run(
 
     # 6) Generate transcript
     print("\n[6/6] Generating transcript...")
-    if output_format == "srt":
-        transcript = processor.create_srt_transcript(whisper_result)
-    else:
-        transcript = processor.create_transcript(whisper_result)
-
     from datetime import datetime
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     transcript_path = os.path.join(output_dir, f"{title_clean}_{quality_suffix}_{ts}.{output_format}")
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        f.write(transcript)
+    processor.write_transcript(transcript_path, whisper_result, output_format=output_format)
 
     # Cleanup
     safe_file_removal(video_path, audio_path)
 
     print(f"\n=== DONE ===")
     print(f"Transcript: {transcript_path}")
-    print(f"Lines: {len(transcript.splitlines())}")
+    # Count and keep the preview while iterating, without reading the whole file back
+    preview = []
+    total_lines = 0
+    with open(transcript_path, encoding="utf-8") as f:
+        for total_lines, line in enumerate(f, 1):
+            if total_lines <= 30:
+                preview.append(line.rstrip("\n"))
+    print(f"Lines: {total_lines}")
     print(f"\n--- Preview (first 30 lines) ---")
-    for line in transcript.split("\n")[:30]:
+    for line in preview:
         print(line)
 
 
@@ -3,9 +3,18 @@ Utility functions for the video transcriber application.
 """
 import re
 import os
-from datetime import datetime
+import threading
+import time
 from typing import Optional, Tuple
 
+# Characters dropped from filenames: decorative unicode symbols and ASCII characters that are
+# problematic on filesystems, removed in a single regex pass. ❤️ is two code points (heart +
+# variation selector), hence the alternation.
+_FILENAME_BAD_RE = re.compile('❤️|[' + re.escape('♥♡ღ⭐㉦✧》《♠♦♣✿ꈍᴗ★/@!~*[]#$%^&()-_=+<>?;:\'"') + ']')
+
+# HH:MM:SS, MM:SS or SS (hour and minute groups are optional)
+_TIME_RE = re.compile(r'(?:(?:(\d+):)?(\d+):)?(\d+)')
+
 
 def convert_time_to_seconds(time_str: str) -> Optional[int]:
     """
@@ -17,18 +26,12 @@ def convert_time_to_seconds(time_str: str) -> Optional[int]:
     Returns:
         Seconds as integer, or None if invalid format
     """
-    try:
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            h, m, s = map(int, parts)
-            return h * 3600 + m * 60 + s
-        elif len(parts) == 2:
-            m, s = map(int, parts)
-            return m * 60 + s
-        else:
-            return int(parts[0])
-    except ValueError:
+    match = _TIME_RE.fullmatch(time_str.strip())
+    if not match:
         return None
+    
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds)
 
 
 def clean_filename(filename: str) -> str:
@@ -41,17 +44,7 @@ def clean_filename(filename: str) -> str:
     Returns:
         Cleaned filename safe for filesystem
     """
-    # Remove special characters that are problematic in filenames
-    import re
-    # Remove common unicode special characters one by one to avoid regex issues
-    chars_to_remove = ['♥', '♡', 'ღ', '⭐', '㉦', '✧', '》', '《', '♠', '♦', '❤️', '♣', '✿', 'ꈍ', 'ᴗ', '★']
-    cleaned = filename
-    for char in chars_to_remove:
-        cleaned = cleaned.replace(char, '')
-    
-    # Then handle ASCII special characters
-    cleaned = re.sub(r'[/@!~*\[\]#$%^&()\-_=+<>?;:\'"]', '', cleaned)
-    return cleaned
+    return _FILENAME_BAD_RE.sub('', filename)
 
 
 def format_time(seconds: float) -> str:
@@ -64,12 +57,29 @@ def format_time(seconds: float) -> str:
     Returns:
         Formatted time string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds = int(seconds % 60)
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
+# (epoch second, formatted timestamp) of the last generate_filename call
+_timestamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _filename_timestamp() -> str:
+    """
+    Local time as YYYYMMDD_HHMMSS, formatted at most once per second.
+    
+    Returns:
+        Timestamp string shared by all files named within the same second
+    """
+    global _timestamp_cache
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache = (now, time.strftime("%Y%m%d_%H%M%S", time.localtime(now)))
+    return _timestamp_cache[1]
+
+
 def generate_filename(title: str, quality: str, extension: str) -> str:
     """
     Generate filename with timestamp and quality.
@@ -83,7 +93,7 @@ def generate_filename(title: str, quality: str, extension: str) -> str:
         Generated filename
     """
     clean_title = clean_filename(title)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _filename_timestamp()
     return f"{clean_title}_{quality}_{timestamp}.{extension}"
 
 
@@ -109,7 +119,8 @@ def validate_time_range(start_time: str, end_time: str) -> Tuple[Optional[int],
         Tuple of (start_seconds, end_seconds, error_message)
     """
     start_seconds = convert_time_to_seconds(start_time)
-    end_seconds = convert_time_to_seconds(end_time)
+    # Identical strings parse identically (and then fail the ordering check below)
+    end_seconds = start_seconds if end_time == start_time else convert_time_to_seconds(end_time)
     
     if start_seconds is None or end_seconds is None:
         return None, None, "올바른 시간 형식을 입력해주세요. (HH:MM:SS)"
@@ -129,7 +140,37 @@ def safe_file_removal(*file_paths: str) -> None:
     """
     for file_path in file_paths:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            os.remove(file_path)  # A missing file just raises FileNotFoundError; no exists() probe
         except Exception:
-            pass  # Ignore errors during cleanup
\ No newline at end of file
+            pass  # Ignore errors during cleanup
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace outgoing API requests."""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second (sustained request rate)
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)